@@ -0,0 +1,81 @@
+"""
+Import-time and cold-start benchmark for short-lived workers.
+
+Each case runs in a fresh interpreter, best of `--runs`, and reports the time above a bare interpreter start.
+The eager case imports requests and pydantic up front, as the client did before they were loaded lazily.
+
+    python benchmarks/cold_start.py --runs 10
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+TENANT_ID = "0b5d8f5e-8c1e-4a9a-9d1e-2f1e4c5b6a7d"
+
+CASES = [
+    ("interpreter", "pass"),
+    ("import equiwatt_api.client", "import equiwatt_api.client"),
+    (
+        "import + construct",
+        f"from equiwatt_api.client import EquiwattSaaSClient; EquiwattSaaSClient('key', '{TENANT_ID}')",
+    ),
+    (
+        "eager requests + pydantic",
+        "import requests, pydantic; from equiwatt_api.client import EquiwattSaaSClient; "
+        f"EquiwattSaaSClient('key', '{TENANT_ID}')",
+    ),
+]
+
+HEAVY_MODULES = ("requests", "pydantic")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code: str):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    return subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True, text=True)
+
+
+def best_of(code: str, runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        _run(code)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def loaded_heavy_modules() -> list:
+    code = (
+        f"import sys; from equiwatt_api.client import EquiwattSaaSClient; EquiwattSaaSClient('key', '{TENANT_ID}'); "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    return [name for name in _run(code).stdout.strip().split(",") if name]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="The runs per case, the best one is reported")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    for label, code in CASES:
+        seconds = best_of(code, args.runs)
+        if baseline is None:
+            baseline = seconds
+            print(f"{label:<28} {seconds * 1000:8.1f} ms")
+        else:
+            print(f"{label:<28} {seconds * 1000:8.1f} ms  (+{(seconds - baseline) * 1000:.1f} ms)")
+
+    loaded = loaded_heavy_modules()
+    if loaded:
+        print(f"loaded after import + construct: {', '.join(loaded)}")
+        return 1
+    print(f"not loaded after import + construct: {', '.join(HEAVY_MODULES)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
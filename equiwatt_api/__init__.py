@@ -1 +1,37 @@
-from .client import EquiwattSaaSClient # noqa
\ No newline at end of file
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Exports are imported on first access, so `import equiwatt_api` stays cheap for short-lived workers that only
+# need part of the package.
+_EXPORTS = {
+    "EquiwattSaaSClient": ".client",
+    "get_default_client": ".client",
+    "set_default_client": ".client",
+    "EquiwattClientPool": ".pool",
+    "CircuitBreaker": ".breaker",
+    "CircuitBreakerRegistry": ".breaker",
+    "EventProgressUpdate": ".watcher",
+    "EventProgressWatcher": ".watcher",
+    "ResultStore": ".store",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .client import EquiwattSaaSClient, get_default_client, set_default_client # noqa
+    from .pool import EquiwattClientPool # noqa
+    from .breaker import CircuitBreaker, CircuitBreakerRegistry # noqa
+    from .watcher import EventProgressUpdate, EventProgressWatcher # noqa
+    from .store import ResultStore # noqa
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,125 @@
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+from equiwatt_api.schema.paginator import PowerResponsePaginatedResponse
+
+
+class PageSizeTuner():
+    """
+    PageSizeTuner adjusts the `pageSize` of paginated listings between pages so each page takes about
+    `target_latency` seconds: the page size doubles while pages are fast and halves while they are slow, within
+    `min_page_size` and `max_page_size` and, when set, `max_page_bytes`. The tuned size is remembered per
+    endpoint for the next walk.
+
+    Pages are re-sliced so callers still get lists of `chunk_size` items, only the last list may be shorter.
+    """
+
+    def __init__(
+        self,
+        target_latency: float = 1.0,
+        min_page_size: int = 25,
+        max_page_size: int = 1000,
+        max_page_bytes: Optional[int] = None,
+        tolerance: float = 1.5,
+    ):
+        """
+        Args:
+            target_latency (float, optional): The seconds a page should take. Defaults to 1.
+            min_page_size (int, optional): The smallest page size. Defaults to 25.
+            max_page_size (int, optional): The largest page size. Defaults to 1000.
+            max_page_bytes (int, optional): The largest response body size. Pages are not grown past it.
+            tolerance (float, optional): How far latency may drift from the target, as a factor, before the page
+                size changes. Defaults to 1.5.
+        """
+        self.target_latency = target_latency
+        self.min_page_size = min_page_size
+        self.max_page_size = max_page_size
+        self.max_page_bytes = max_page_bytes
+        self.tolerance = tolerance
+        self._sizes: Dict[str, int] = {}
+        self._caps: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def page_size(self, endpoint: str, default: int) -> int:
+        """
+        Return the tuned page size of an endpoint, or `default` clamped to the bounds if it was not tuned yet.
+        """
+        with self._lock:
+            size = self._sizes.get(endpoint)
+            cap = self._caps.get(endpoint, self.max_page_size)
+        if size is None:
+            size = max(self.min_page_size, min(default, self.max_page_size))
+        return min(size, cap)
+
+    def page_sizes(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._sizes)
+
+    def _next_size(self, endpoint: str, size: int, elapsed: float, size_bytes: Optional[int], offset: int) -> int:
+        cap = min(self._caps.get(endpoint, self.max_page_size), self.max_page_size)
+        too_big = self.max_page_bytes is not None and size_bytes is not None and size_bytes > self.max_page_bytes
+        if (elapsed > self.target_latency * self.tolerance or too_big) and size // 2 >= self.min_page_size:
+            return size // 2
+        fits = self.max_page_bytes is None or size_bytes is None or size_bytes * 2 <= self.max_page_bytes
+        # Only grow on an aligned offset so the next page starts exactly where this one ended.
+        if elapsed * self.tolerance < self.target_latency and fits and size * 2 <= cap and offset % (size * 2) == 0:
+            return size * 2
+        return size
+
+    def paginate(
+        self,
+        fetch: Callable[[int, int], PowerResponsePaginatedResponse],
+        chunk_size: int,
+        endpoint: str,
+    ) -> Iterator[List]:
+        """
+        Walk a listing with tuned page sizes, yielding lists of `chunk_size` items.
+
+        Args:
+            fetch (Callable[[int, int], PowerResponsePaginatedResponse]): Returns the page for a page number and
+                page size.
+            chunk_size (int): The number of items per yielded list.
+            endpoint (str): The key the tuned size is remembered under.
+        """
+        size = self.page_size(endpoint, chunk_size)
+        offset = 0
+        buffer = []
+        yielded = False
+        while True:
+            page = offset // size + 1
+            skip = offset - (page - 1) * size
+            started = time.monotonic()
+            paginated_response = fetch(page, size)
+            # Prefer the duration of the HTTP call recorded by the client: the wall time also counts waits for
+            # the pool's rate and concurrency limits, which a smaller page would only make longer.
+            elapsed = getattr(paginated_response, "call_seconds", None)
+            if elapsed is None:
+                elapsed = time.monotonic() - started
+            last = paginated_response.pagination.currentPage >= paginated_response.pagination.totalPages
+            items = paginated_response.items
+
+            served = paginated_response.pagination.itemsPerPage or len(items)
+            if not last and 0 < served < size:
+                # The platform caps the page size: remember the cap and fetch again with it.
+                with self._lock:
+                    self._caps[endpoint] = served
+                    self._sizes[endpoint] = served
+                size = served
+                continue
+
+            buffer.extend(items[skip:])
+            offset += max(0, len(items) - skip)
+            while len(buffer) >= chunk_size:
+                yield buffer[:chunk_size]
+                del buffer[:chunk_size]
+                yielded = True
+            if last or not items:
+                break
+
+            size = self._next_size(endpoint, size, elapsed, getattr(paginated_response, "size_bytes", None), offset)
+            with self._lock:
+                self._sizes[endpoint] = size
+
+        if buffer or not yielded:
+            yield buffer
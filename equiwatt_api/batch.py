@@ -0,0 +1,115 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, Generic, Hashable, Iterable, Optional, TypeVar
+
+from .deadline import Deadline
+from .exceptions import CircuitOpenException, DeadlineExceeded, EquiwattAPIException
+
+K = TypeVar('K', bound=Hashable)
+T = TypeVar('T')
+
+
+class BatchResult(Dict[K, T], Generic[K, T]):
+    """
+    BatchResult maps each key of a batch that succeeded to its result. Keys that failed are left out and their
+    exceptions are kept in `errors` instead.
+
+    Attributes:
+    ----------
+    errors : Dict[K, Exception]
+        The exception raised for each key that failed.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.errors: Dict[K, Exception] = {}
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def run_batch(
+    fn: Callable[[K], T],
+    keys: Iterable[K],
+    max_workers: int = 8,
+    deadline: Optional[Deadline] = None,
+) -> BatchResult[K, T]:
+    """
+    Call `fn` for every distinct key on a bounded thread pool and collect the results.
+
+    Args:
+        fn (Callable): The function called with each key.
+        keys (Iterable): The keys of the batch.
+        max_workers (int, optional): The number of calls in flight. Defaults to 8.
+        deadline (Deadline, optional): The budget of the batch. Keys that did not finish in time are recorded in
+            `errors` as `DeadlineExceeded` and the batch returns without waiting for them.
+
+    Returns:
+        BatchResult: The results and errors by key.
+    """
+    keys = list(dict.fromkeys(keys))
+    result = BatchResult()
+    if not keys:
+        return result
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(keys))))
+    try:
+        futures = {executor.submit(fn, key): key for key in keys}
+        done, _ = wait(futures, timeout=None if deadline is None else deadline.remaining())
+        for future, key in futures.items():
+            if future not in done:
+                future.cancel()
+                result.errors[key] = DeadlineExceeded("Deadline exceeded before the request completed")
+                continue
+            try:
+                result[key] = future.result()
+            except Exception as e:
+                result.errors[key] = e
+    finally:
+        executor.shutdown(wait=False)
+    return result
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    Whether a failed call is worth retrying: connection problems, throttling and server errors.
+    """
+    if isinstance(error, CircuitOpenException):
+        return False
+    if isinstance(error, EquiwattAPIException):
+        return error.status_code is not None and (error.status_code == 429 or error.status_code >= 500)
+    # requests is only loaded once a request was sent, so an error cannot come from it before then.
+    requests = sys.modules.get("requests")
+    return requests is not None and isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+def with_retries(
+    fn: Callable[[K], T],
+    retries: int = 3,
+    backoff: float = 0.5,
+    deadline: Optional[Deadline] = None,
+    retry_fn: Optional[Callable[[K], T]] = None,
+) -> Callable[[K], T]:
+    """
+    Wrap `fn` so transient failures are retried up to `retries` times with exponential backoff, as long as the
+    deadline leaves time for the retry. Retries call `retry_fn` instead of `fn` when it is set, e.g. to accept a
+    404 from a retried delete whose first attempt went through.
+    """
+    def call(key: K) -> T:
+        attempt = 0
+        while True:
+            try:
+                if attempt and retry_fn is not None:
+                    return retry_fn(key)
+                return fn(key)
+            except Exception as e:
+                if attempt >= retries or not is_transient(e):
+                    raise
+                delay = backoff * (2 ** attempt)
+                if deadline is not None and delay >= deadline.remaining():
+                    raise DeadlineExceeded("Deadline exceeded before the request could be retried") from e
+                time.sleep(delay)
+                attempt += 1
+    return call
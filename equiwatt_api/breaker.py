@@ -0,0 +1,190 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from .exceptions import CircuitOpenException
+
+
+class CircuitBreaker():
+    """
+    CircuitBreaker tracks the outcome of the last `window_size` calls to one endpoint and opens when too many
+    of them failed or were slow. While open, calls fail fast with `CircuitOpenException`. After `reset_timeout`
+    seconds the breaker goes half-open and lets `half_open_max_calls` probe calls through: if they all succeed
+    it closes again, otherwise it opens for another `reset_timeout`.
+
+    A breaker is thread safe and never blocks, so it can be shared by worker threads and async tasks alike.
+    """
+
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: float = 0.5,
+        slow_call_threshold: float = 0.5,
+        slow_call_duration: float = 10.0,
+        window_size: int = 20,
+        min_calls: int = 10,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        """
+        Args:
+            name (str): The logical endpoint the breaker protects.
+            failure_threshold (float, optional): The share of failed calls that opens the breaker. Defaults to 0.5.
+            slow_call_threshold (float, optional): The share of slow calls that opens the breaker. Defaults to 0.5.
+            slow_call_duration (float, optional): Calls taking longer than this many seconds are slow. Defaults to 10.
+            window_size (int, optional): The number of recent calls the rates are computed over. Defaults to 20.
+            min_calls (int, optional): The number of calls needed in the window before the breaker can open.
+                Defaults to 10.
+            reset_timeout (float, optional): Seconds to stay open before probing the endpoint. Defaults to 30.
+            half_open_max_calls (int, optional): The number of probe calls allowed while half-open. Defaults to 1.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.slow_call_duration = slow_call_duration
+        self.min_calls = min(min_calls, window_size)
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._calls = deque(maxlen=window_size)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+            self._probe_successes = 0
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._calls.clear()
+
+    def before_call(self):
+        """
+        Reserve a call, raising `CircuitOpenException` when the endpoint must not be called.
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return
+            self._rejected += 1
+            retry_after = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+        raise CircuitOpenException(self.name, retry_after=retry_after)
+
+    def release(self):
+        """
+        Give back a call reserved with `before_call` without recording an outcome, e.g. when the caller gave up on
+        its own deadline.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record(self, duration: float, failed: bool):
+        """
+        Record the outcome of a call reserved with `before_call`.
+        """
+        slow = duration >= self.slow_call_duration
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                if failed or slow:
+                    self._open()
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_max_calls:
+                    self._state = self.CLOSED
+                    self._calls.clear()
+                return
+            if self._state == self.OPEN:
+                return
+            self._calls.append((failed, slow))
+            total = len(self._calls)
+            if total < self.min_calls:
+                return
+            failures = sum(1 for call_failed, _ in self._calls if call_failed)
+            slow_calls = sum(1 for _, call_slow in self._calls if call_slow)
+            if failures / total >= self.failure_threshold or slow_calls / total >= self.slow_call_threshold:
+                self._open()
+
+    def snapshot(self) -> Dict:
+        """
+        Return the breaker state for dashboards.
+        """
+        with self._lock:
+            self._refresh()
+            total = len(self._calls)
+            failures = sum(1 for call_failed, _ in self._calls if call_failed)
+            slow_calls = sum(1 for _, call_slow in self._calls if call_slow)
+            return {
+                "state": self._state,
+                "calls": total,
+                "failureRate": failures / total if total else 0.0,
+                "slowCallRate": slow_calls / total if total else 0.0,
+                "rejectedCalls": self._rejected,
+                "openedSecondsAgo": time.monotonic() - self._opened_at if self._state != self.CLOSED else None,
+            }
+
+
+class CircuitBreakerRegistry():
+    """
+    CircuitBreakerRegistry holds one `CircuitBreaker` per logical endpoint, for example
+    `GET /api/v1/events/{uuid}/assets/stats`. Pass the same registry to several clients to share breakers.
+    """
+
+    def __init__(self, **defaults):
+        """
+        Args:
+            **defaults: The settings of every breaker created by the registry, see `CircuitBreaker`.
+        """
+        self.defaults = defaults
+        self._overrides: Dict[str, Dict] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, endpoint: str, **settings):
+        """
+        Use custom settings for one endpoint, replacing its breaker if it already exists.
+        """
+        with self._lock:
+            self._overrides[endpoint] = settings
+            self._breakers.pop(endpoint, None)
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is not None:
+            return breaker
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                settings = dict(self.defaults, **self._overrides.get(endpoint, {}))
+                breaker = self._breakers[endpoint] = CircuitBreaker(endpoint, **settings)
+            return breaker
+
+    def snapshot(self, endpoint: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        Return the state of all breakers, or of one endpoint, keyed by endpoint.
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+        if endpoint is not None:
+            breakers = {endpoint: breakers[endpoint]} if endpoint in breakers else {}
+        return {name: breaker.snapshot() for name, breaker in breakers.items()}
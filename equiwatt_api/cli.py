@@ -0,0 +1,314 @@
+"""
+Command line interface for bulk jobs against the equiwatt PowerResponse platform.
+
+    equiwatt export assets --format csv --output assets.csv
+    equiwatt export event-asset-stats --event EVENT_UUID --output stats.ndjson
+    equiwatt import readings readings.csv --workers 8 --batch-size 1000 --checkpoint readings.ckpt
+
+Credentials are read from `--api-key`/`--tenant-id` or the `EQUIWATT_API_KEY`/`EQUIWATT_TENANT_ID` environment
+variables.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Set, TextIO
+
+from .client import EquiwattSaaSClient
+from .deadline import Deadline
+from .exceptions import DeadlineExceeded, EquiwattAPIException
+from .schema.asset import EnergyConsumptionDataPoint
+
+
+class _Progress():
+    """
+    Prints row counts and throughput to stderr at most every `interval` seconds.
+    """
+
+    def __init__(self, label: str, interval: float = 2.0, stream: TextIO = sys.stderr):
+        self.label = label
+        self.interval = interval
+        self.stream = stream
+        self.rows = 0
+        self.started = time.monotonic()
+        self.reported = self.started
+        self.lock = threading.Lock()
+
+    def add(self, rows: int):
+        with self.lock:
+            self.rows += rows
+            now = time.monotonic()
+            if now - self.reported >= self.interval:
+                self.reported = now
+                self._print(now)
+
+    def _print(self, now: float):
+        elapsed = max(now - self.started, 1e-9)
+        self.stream.write(f"{self.label}: {self.rows} rows, {self.rows / elapsed:.0f} rows/s, {elapsed:.1f}s\n")
+        self.stream.flush()
+
+    def finish(self):
+        with self.lock:
+            self._print(time.monotonic())
+
+
+def _flatten(obj, prefix: str = "") -> Dict:
+    row = {}
+    for key, value in vars(obj).items():
+        if hasattr(value, "__dict__"):
+            row.update(_flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (list, dict)):
+            row[f"{prefix}{key}"] = json.dumps(value, default=lambda item: vars(item))
+        else:
+            row[f"{prefix}{key}"] = value
+    return row
+
+
+def _write_rows(pages: Iterable[List], output: TextIO, fmt: str, progress: _Progress):
+    writer = None
+    for page in pages:
+        for item in page:
+            row = _flatten(item)
+            if fmt == "csv":
+                if writer is None:
+                    writer = csv.DictWriter(output, fieldnames=list(row), extrasaction="ignore")
+                    writer.writeheader()
+                writer.writerow(row)
+            else:
+                output.write(json.dumps(row))
+                output.write("\n")
+        progress.add(len(page))
+
+
+def _read_rows(path: str, fmt: str) -> Iterator[Dict]:
+    with open(path, newline="") as f:
+        if fmt == "csv":
+            for row in csv.DictReader(f):
+                yield {key: value for key, value in row.items() if value not in ("", None)}
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _batches(rows: Iterator[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _checkpoint_header(args) -> Dict:
+    stat = os.stat(args.file)
+    return {
+        "dataset": args.dataset,
+        "file": os.path.abspath(args.file),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "batchSize": args.batch_size,
+    }
+
+
+def _load_checkpoint(path: Optional[str], header: Dict) -> Set[int]:
+    """
+    Read the batches completed by an earlier run. The first line of a checkpoint records the import it belongs to,
+    as batch indexes only match the same file split with the same batch size.
+    """
+    if not path or not os.path.exists(path) or os.path.getsize(path) == 0:
+        return set()
+    with open(path) as f:
+        try:
+            recorded = json.loads(f.readline())
+        except ValueError:
+            recorded = None
+        if recorded != header:
+            raise EquiwattAPIException(
+                f"Checkpoint {path} belongs to another import: the dataset, file or --batch-size changed. "
+                "Delete it to start over."
+            )
+        return {int(line) for line in f if line.strip()}
+
+
+def _format_of(path: Optional[str], fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    if path and path.lower().endswith(".csv"):
+        return "csv"
+    return "ndjson"
+
+
+def _client(args) -> EquiwattSaaSClient:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    workers = getattr(args, "workers", None)
+    if workers:
+        # Keep one pooled connection per worker, the default pool only keeps 10 per host.
+        adapter = HTTPAdapter(pool_maxsize=workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+    client = EquiwattSaaSClient(
+        api_key=args.api_key, tenant_id=args.tenant_id, base_url=args.base_url, session=session
+    )
+    if args.sandbox:
+        client.enable_sandbox()
+    return client
+
+
+def export_command(args) -> int:
+    client = _client(args)
+    deadline = Deadline.coerce(args.deadline)
+    if args.dataset == "assets":
+        pages = client.get_assets(chunk_size=args.chunk_size, deadline=deadline)
+    elif args.dataset == "scheme-assets":
+        if not args.scheme:
+            raise EquiwattAPIException("--scheme is required to export scheme assets")
+        pages = client.scheme_assets(args.scheme, args.status, chunk_size=args.chunk_size, deadline=deadline)
+    else:
+        if not args.event:
+            raise EquiwattAPIException("--event is required to export event asset stats")
+        pages = client.get_event_asset_stats(args.event, chunk_size=args.chunk_size, deadline=deadline)
+
+    fmt = _format_of(args.output, args.format)
+    progress = _Progress(f"export {args.dataset}")
+    try:
+        if args.output in (None, "-"):
+            _write_rows(pages, sys.stdout, fmt, progress)
+        else:
+            with open(args.output, "w", newline="") as output:
+                _write_rows(pages, output, fmt, progress)
+    except DeadlineExceeded as e:
+        progress.finish()
+        sys.stderr.write(f"{e}, the export is incomplete.\n")
+        return 1
+    progress.finish()
+    return 0
+
+
+def import_command(args) -> int:
+    client = _client(args)
+    deadline = Deadline.coerce(args.deadline)
+    if args.dataset == "assets":
+        def send(batch):
+            return client.create_bulk_assets(batch, deadline=deadline)
+    else:
+        def send(batch):
+            readings = [EnergyConsumptionDataPoint(**row) for row in batch]
+            return client.send_energy_readings(readings, deadline=deadline)
+
+    fmt = _format_of(args.file, args.format)
+    header = _checkpoint_header(args)
+    completed = _load_checkpoint(args.checkpoint, header)
+    checkpoint = None
+    if args.checkpoint:
+        checkpoint = open(args.checkpoint, "a")
+        if checkpoint.tell() == 0:
+            checkpoint.write(f"{json.dumps(header)}\n")
+            checkpoint.flush()
+    progress = _Progress(f"import {args.dataset}")
+    failed = 0
+    unsent = 0
+
+    def record(future, index, size):
+        nonlocal failed
+        try:
+            future.result()
+        except Exception as e:
+            failed += 1
+            sys.stderr.write(f"batch {index} failed: {e}\n")
+            return
+        if checkpoint is not None:
+            checkpoint.write(f"{index}\n")
+            checkpoint.flush()
+        progress.add(size)
+
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            in_flight = {}
+            for index, batch in enumerate(_batches(_read_rows(args.file, fmt), args.batch_size)):
+                if index in completed:
+                    continue
+                if deadline is not None and deadline.expired:
+                    # Keep reading to count the batches left for a rerun.
+                    if not unsent:
+                        sys.stderr.write("Deadline exceeded, no more batches are sent.\n")
+                    unsent += 1
+                    continue
+                # Keep a bounded number of batches in memory.
+                while len(in_flight) >= args.workers * 2:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record(future, *in_flight.pop(future))
+                in_flight[executor.submit(send, batch)] = (index, len(batch))
+            for future in list(in_flight):
+                record(future, *in_flight.pop(future))
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+    progress.finish()
+
+    if failed or unsent:
+        if failed:
+            sys.stderr.write(f"{failed} batches failed.\n")
+        if unsent:
+            sys.stderr.write(f"{unsent} batches were not sent before the deadline.\n")
+        if args.checkpoint:
+            sys.stderr.write("Rerun with the same --checkpoint to send them.\n")
+        return 1
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="equiwatt", description="Bulk jobs for the equiwatt PowerResponse API")
+    parser.add_argument("--api-key", default=os.environ.get("EQUIWATT_API_KEY"))
+    parser.add_argument("--tenant-id", default=os.environ.get("EQUIWATT_TENANT_ID"))
+    parser.add_argument("--base-url", default=os.environ.get("EQUIWATT_BASE_URL", ""))
+    parser.add_argument("--sandbox", action="store_true", help="Use the sandbox platform")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Stream a listing to NDJSON or CSV")
+    export.add_argument("dataset", choices=["assets", "scheme-assets", "event-asset-stats"])
+    export.add_argument("--output", "-o", help="The output file, stdout by default")
+    export.add_argument("--format", choices=["ndjson", "csv"], help="Inferred from the output extension by default")
+    export.add_argument("--chunk-size", type=int, default=100, help="The page size")
+    export.add_argument("--scheme", help="The scheme UUID for scheme-assets")
+    export.add_argument("--status", help="The asset state for scheme-assets, e.g. OPT_IN")
+    export.add_argument("--event", help="The event UUID for event-asset-stats")
+    export.add_argument("--deadline", type=float, help="Stop after this many seconds, keeping what was exported")
+    export.set_defaults(handler=export_command)
+
+    upload = commands.add_parser("import", help="Stream a CSV or NDJSON file to the platform")
+    upload.add_argument("dataset", choices=["assets", "readings"])
+    upload.add_argument("file")
+    upload.add_argument("--format", choices=["ndjson", "csv"], help="Inferred from the file extension by default")
+    upload.add_argument("--batch-size", type=int, default=500, help="The rows sent per request")
+    upload.add_argument("--workers", type=int, default=4, help="The requests in flight")
+    upload.add_argument("--checkpoint", help="A file recording completed batches, used to resume after a failure")
+    upload.add_argument("--deadline", type=float, help="Stop sending batches after this many seconds")
+    upload.set_defaults(handler=import_command)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except EquiwattAPIException as e:
+        sys.stderr.write(f"{e}\n")
+        return 1
+    except OSError as e:
+        sys.stderr.write(f"{e}\n")
+        return 1
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
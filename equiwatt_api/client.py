@@ -1,43 +1,311 @@
+import copy
+import os
+import threading
 import uuid
 import hmac
 import hashlib
-import requests
-from typing import Iterator, List, Optional
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar, Union
 from equiwatt_api.response import AssetDetails, EventAssetBaseline, EventAssetDetails, EventAssetState, EventDetails, EventAssetStat, EventStats
 from equiwatt_api.schema.paginator import PowerResponsePaginatedResponse
-from .schema.asset import (
-    AssetCreatePayload,
-    EnergyConsumptionDataPoint,
-    EventAssetOptPayload,
-    EventAssetOptPayloadStatus
+from .autotune import PageSizeTuner
+from .batch import BatchResult, run_batch, with_retries
+from .breaker import CircuitBreakerRegistry
+from .coalesce import SingleFlight
+from .deadline import DEFAULT_TIMEOUT, Deadline
+from .exceptions import DeadlineExceeded, EquiwattAPIException
+from .export import (
+    ASSET_COLUMNS,
+    EVENT_ASSET_BASELINE_COLUMNS,
+    EVENT_ASSET_STAT_COLUMNS,
+    explode_baselines,
+    export_pages,
 )
-from .exceptions import EquiwattAPIException
-from pydantic import ValidationError
 from typing import Dict, Literal
 from datetime import datetime
 
+# requests, pydantic and the payload schemas are imported on first use, so importing the client and
+# constructing it stay cheap for short-lived workers.
+if TYPE_CHECKING:
+    import requests
+    from .schema.asset import EnergyConsumptionDataPoint
+
+T = TypeVar('T')
+
+_session_lock = threading.Lock()
+
+
+@lru_cache(maxsize=256)
+def _is_valid_tenant_id(tenant_id: str) -> bool:
+    try:
+        uuid.UUID(tenant_id)
+    except ValueError:
+        return False
+    return True
+
 
 class EquiwattSaaSClient:
-    def __init__(self, api_key: str, tenant_id: str, base_url="", version: str = "1.0"):
+    def __init__(
+        self,
+        api_key: str,
+        tenant_id: str,
+        base_url="",
+        version: str = "1.0",
+        session: Optional["requests.Session"] = None,
+        limiter=None,
+        breakers: Optional[CircuitBreakerRegistry] = None,
+        coalesce_window: Optional[float] = None,
+        single_flight: Optional[SingleFlight] = None,
+        page_tuner: Optional[PageSizeTuner] = None,
+        timeout: Union[float, Tuple[float, float], None] = DEFAULT_TIMEOUT,
+    ):
+        """
+        Args:
+            api_key (str): The API key of the tenant.
+            tenant_id (str): The tenant UUID.
+            base_url (str, optional): The platform URL.
+            version (str, optional): The API version sent in the `x-api-version` header.
+            session (requests.Session, optional): A session to send requests through. Clients created by
+                `EquiwattClientPool` share one session (and its connection pool) across tenants. Defaults to a
+                session of the client's own, created on the first request.
+            limiter (optional): Used by the pool to enforce per-tenant concurrency and rate limits. Its
+                `slot(deadline)` context manager is entered around every request.
+            breakers (CircuitBreakerRegistry, optional): Circuit breakers keyed by endpoint. When set, calls to an
+                endpoint that keeps failing or timing out raise `CircuitOpenException` without being sent.
+            coalesce_window (float, optional): Enables coalescing of identical concurrent calls to
+                `get_event_details`, `get_event_stats` and `get_scheme_list`: callers share one request and its
+                parsed result, which is reused for `coalesce_window` seconds. Shared results must not be modified.
+                Defaults to None, which disables coalescing.
+            single_flight (SingleFlight, optional): The coalescing state to use instead of `coalesce_window`, used by
+                the pool to coalesce across clients.
+            page_tuner (PageSizeTuner, optional): Enables page size autotuning for the paginated generators, see
+                `enable_page_autotuning`.
+            timeout (float | Tuple[float, float], optional): The (connect, read) timeout of every request in seconds.
+                Defaults to (5, 30). Operations that take a `deadline` cap it to the remaining budget.
+        """
         if api_key and tenant_id:
-            try:
-                uuid.UUID(tenant_id)
-            except ValueError:
+            if not _is_valid_tenant_id(tenant_id):
                 raise EquiwattAPIException("Invalid tenant ID")
             self.base_url = base_url
             self.api_key = api_key
             self.headers = {"tenant": tenant_id, "x-api-key": f"{self.api_key}", "Content-Type": "application/json"}
             if version:
                 self.headers["x-api-version"] = version
+            self._session = session
+            self.limiter = limiter
+            self.breakers = breakers
+            if single_flight is None and coalesce_window is not None:
+                single_flight = SingleFlight(coalesce_window)
+            self.single_flight = single_flight
+            self.page_tuner = page_tuner
+            self.timeout = timeout
         else:
             raise EquiwattAPIException("API key and tenant id are required")
 
+    @property
+    def tenant_id(self) -> str:
+        return self.headers["tenant"]
+
+    @property
+    def session(self) -> "requests.Session":
+        """
+        The session requests are sent through, created on first use.
+        """
+        if self._session is None:
+            with _session_lock:
+                if self._session is None:
+                    import requests
+                    self._session = requests.Session()
+        return self._session
+
+    @session.setter
+    def session(self, session: "requests.Session"):
+        self._session = session
+
+    def clone(self, api_key: Optional[str] = None, tenant_id: Optional[str] = None) -> "EquiwattSaaSClient":
+        """
+        Return a copy of the client that shares its session and connections, circuit breakers, coalescing and
+        page tuning, optionally with another API key or tenant. Cloning skips validation and setup, so it is a
+        cheap way to derive clients from a warm one.
+
+        Raises:
+            EquiwattAPIException: If the tenant id is invalid, or the client belongs to a pool and the tenant
+                changes. Use `EquiwattClientPool.add_tenant` for pooled tenants.
+        """
+        clone = copy.copy(self)
+        clone._session = self.session
+        clone.headers = dict(self.headers)
+        if api_key:
+            clone.api_key = api_key
+            clone.headers["x-api-key"] = api_key
+        if tenant_id and tenant_id != self.tenant_id:
+            if not _is_valid_tenant_id(tenant_id):
+                raise EquiwattAPIException("Invalid tenant ID")
+            if self.limiter is not None:
+                raise EquiwattAPIException("Use EquiwattClientPool.add_tenant to add tenants to a pool")
+            clone.headers["tenant"] = tenant_id
+        return clone
+
+    def _send(
+        self, method: str, url: str, endpoint: Optional[str], deadline: Optional[Deadline], **kwargs
+    ) -> "requests.Response":
+        if self.limiter is None:
+            return self._guarded_send(method, url, endpoint, deadline, **kwargs)
+        # Breakers are only consulted once the tenant's turn came, so time spent queued behind the tenant's own
+        # rate and concurrency limits never counts as endpoint latency.
+        with self.limiter.slot(deadline):
+            return self._guarded_send(method, url, endpoint, deadline, **kwargs)
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        endpoint: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        **kwargs,
+    ) -> "requests.Response":
+        """
+        Send a request with this client's tenant headers through its session.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The full URL.
+            endpoint (str, optional): The URL template of the endpoint, e.g. `/api/v1/events/{uuid}/stats`.
+                Calls are grouped by method and endpoint for circuit breaking.
+            deadline (Deadline, optional): The budget of the operation the request belongs to.
+
+        Raises:
+            DeadlineExceeded: If the deadline is spent before or while the request is sent.
+        """
+        import requests
+
+        try:
+            return self._send(method, url, endpoint, deadline, **kwargs)
+        except requests.Timeout as e:
+            if deadline is not None and deadline.expired:
+                raise DeadlineExceeded(f"Deadline of {deadline.seconds}s exceeded") from e
+            raise
+
+    def _guarded_send(
+        self, method: str, url: str, endpoint: Optional[str], deadline: Optional[Deadline], **kwargs
+    ) -> "requests.Response":
+        import requests
+
+        # The timeout is worked out after any wait for the limiter, from the budget that is actually left.
+        kwargs["timeout"] = self.timeout if deadline is None else deadline.timeout(self.timeout)
+        breaker = None
+        if self.breakers is not None and endpoint is not None:
+            breaker = self.breakers.get(f"{method} {endpoint}")
+            breaker.before_call()
+
+        started = time.monotonic()
+        failed = True
+        try:
+            response = self.session.request(method, url, headers=self.headers, **kwargs)
+            failed = response.status_code >= 500 or response.status_code == 429
+        except requests.Timeout:
+            if breaker is not None and deadline is not None and deadline.expired:
+                # The timeout was cut short by the caller's own budget, which says nothing about the endpoint.
+                breaker.release()
+                breaker = None
+            raise
+        finally:
+            call_seconds = time.monotonic() - started
+            if breaker is not None:
+                breaker.record(call_seconds, failed)
+        # The duration of the HTTP call alone, without any wait for the limiter, used for page size tuning.
+        response.call_seconds = call_seconds
+        return response
+
+    def _get_page(
+        self, url: str, endpoint: str, item_class: Type[T], deadline: Optional[Deadline] = None
+    ) -> PowerResponsePaginatedResponse[T]:
+        """
+        GET one page of a paginated listing.
+        """
+        response = self._request("GET", url, endpoint=endpoint, deadline=deadline)
+        if response.status_code != 200:
+            raise EquiwattAPIException.from_response(response)
+        paginated_response = PowerResponsePaginatedResponse[item_class](item_class, **response.json())
+        paginated_response.size_bytes = len(response.content)
+        paginated_response.call_seconds = getattr(response, "call_seconds", None)
+        return paginated_response
+
+    def _paginate(
+        self, fetch: Callable[[int, int], PowerResponsePaginatedResponse[T]], chunk_size: int, endpoint: str
+    ) -> Iterator[List[T]]:
+        """
+        Walk a paginated listing page by page, yielding the items of each page.
+        """
+        if self.page_tuner is not None:
+            yield from self.page_tuner.paginate(fetch, chunk_size, endpoint)
+            return
+
+        page = 1
+        while True:
+            paginated_response = fetch(page, chunk_size)
+            yield paginated_response.items
+            if paginated_response.pagination.currentPage >= paginated_response.pagination.totalPages:
+                break
+            page += 1
+
+    def _get_raw_pages(
+        self, url: Callable[[int, int], str], endpoint: str, page_size: int, deadline: Optional[Deadline] = None
+    ) -> Iterator[List[Dict]]:
+        """
+        Walk a paginated listing yielding the raw JSON items of each page, without building response objects.
+        """
+        page = 1
+        while True:
+            response = self._request("GET", url(page, page_size), endpoint=endpoint, deadline=deadline)
+            if response.status_code != 200:
+                raise EquiwattAPIException.from_response(response)
+            data = response.json()
+            yield data.get("items") or []
+            pagination = data.get("pagination") or {}
+            if not data.get("items") or (pagination.get("currentPage") or page) >= (pagination.get("totalPages") or 0):
+                break
+            page += 1
+
+    def _coalesced_get(
+        self, url: str, endpoint: str, parse: Callable[[Dict], T], deadline: Optional[Deadline] = None
+    ) -> T:
+        """
+        GET a URL and parse the response, sharing the call with identical concurrent calls of the same tenant
+        and API key when coalescing is enabled.
+        """
+        def fetch():
+            response = self._request("GET", url, endpoint=endpoint, deadline=deadline)
+            if response.status_code != 200:
+                raise EquiwattAPIException.from_response(response)
+            return parse(response.json())
+
+        if self.single_flight is None:
+            return fetch()
+        # Calls are only shared between callers with the same credentials.
+        return self.single_flight.do((self.tenant_id, self.api_key, url), fetch, deadline)
+
     def enable_sandbox(self):
         self.base_url = "https://sandbox.equiwatt.com"
 
     def set_service_url(self, url):
         self.base_url = url
 
+    def enable_page_autotuning(self, **settings) -> PageSizeTuner:
+        """
+        Let the paginated generators tune `pageSize` between pages toward a target page latency. Callers still get
+        lists of `chunk_size` items. Tuned sizes are remembered per endpoint for the life of the client.
+
+        Args:
+            **settings: The settings of the tuner, see `PageSizeTuner`.
+
+        Returns:
+            PageSizeTuner: The tuner, its `page_sizes()` shows the tuned size of each endpoint.
+        """
+        self.page_tuner = PageSizeTuner(**settings)
+        return self.page_tuner
+
     def create_asset(
         self,
         userId: str,
@@ -77,6 +345,9 @@ class EquiwattSaaSClient:
         Raises:
             EquiwattAPIException: If there is an error in creating the asset or if the API call fails.
         """
+        from pydantic import ValidationError
+        from .schema.asset import AssetCreatePayload
+
         try:
             payload = AssetCreatePayload(
                 userId=userId,
@@ -99,17 +370,18 @@ class EquiwattSaaSClient:
             raise EquiwattAPIException(f"Invalid payload data: {e.json()}")
 
         url = f"{self.base_url}/api/v1/assets"
-        response = requests.post(url, json=payload.model_dump(exclude_none=True), headers=self.headers)
+        response = self._request("POST", url, endpoint="/api/v1/assets", json=payload.model_dump(exclude_none=True))
         if response.status_code != 201:
             raise EquiwattAPIException.from_response(response)
         return response.json()
 
-    def create_bulk_assets(self, assets: list):
+    def create_bulk_assets(self, assets: list, deadline: Union[Deadline, float, None] = None):
         """
         Create multiple assets in the Equiwatt SaaS platform.
 
         Args:
             assets (list): A list of AssetCreatePayload objects.
+            deadline (Deadline | float, optional): The budget of the upload.
 
         Returns:
             Dict: The response from the API as a dictionary.
@@ -117,6 +389,9 @@ class EquiwattSaaSClient:
         Raises:
             EquiwattAPIException: If there is an error in creating the assets or if the API call fails.
         """
+        from pydantic import ValidationError
+        from .schema.asset import AssetCreatePayload
+
         url = f"{self.base_url}/api/v1/assets/bulk"
         validated_assets = []
         for asset in assets:
@@ -125,13 +400,15 @@ class EquiwattSaaSClient:
             except ValidationError as e:
                 raise EquiwattAPIException(f"Invalid payload data: {e.json()}")
         payload = {"assets": [asset.model_dump() for asset in validated_assets]}
-        response = requests.post(url, json=payload, headers=self.headers)
+        response = self._request(
+            "POST", url, endpoint="/api/v1/assets/bulk", deadline=Deadline.coerce(deadline), json=payload
+        )
         if response.status_code != 201:
             raise EquiwattAPIException.from_response(response)
         return response.json()
 
     def _get_paginated_assets(
-        self, page: int = 1, items_per_page: int = 100
+        self, page: int = 1, items_per_page: int = 100, deadline: Optional[Deadline] = None
     ) -> PowerResponsePaginatedResponse[AssetDetails]:
         """
         Get assets registered in powerResponse platform.
@@ -144,46 +421,137 @@ class EquiwattSaaSClient:
         """
 
         url = f"{self.base_url}/api/v1/assets?page={page}&pageSize={items_per_page}"
-        response = requests.get(url, headers=self.headers)
-        if response.status_code != 200:
-            raise EquiwattAPIException.from_response(response)
-
-        data = response.json()
-        return PowerResponsePaginatedResponse[AssetDetails](AssetDetails, **data)
+        return self._get_page(url, "/api/v1/assets", AssetDetails, deadline)
 
-    def get_assets(self, chunk_size: int = 100) -> Iterator[List[AssetDetails]]:
+    def get_assets(
+        self, chunk_size: int = 100, deadline: Union[Deadline, float, None] = None
+    ) -> Iterator[List[AssetDetails]]:
         """
         This is a generator function that yields a list of assets registered in the powerResponse platform.
 
         Args:
             chunk_size (int, optional): The number of items per chunk. Defaults to 100.
+            deadline (Deadline | float, optional): The budget of the whole walk, in seconds from the first page. Raises
+                `DeadlineExceeded` once spent, after yielding the pages fetched in time.
         """
-        page = 1
-        while True:
-            paginated_response = self._get_paginated_assets(page=page, items_per_page=chunk_size)
-            yield paginated_response.items
-            if paginated_response.pagination.currentPage >= paginated_response.pagination.totalPages:
-                break
-            page += 1
+        deadline = Deadline.coerce(deadline)
+        yield from self._paginate(
+            lambda page, page_size: self._get_paginated_assets(page, page_size, deadline),
+            chunk_size,
+            "/api/v1/assets",
+        )
 
-    def archive_asset(self, assetUUID: str):
+    def archive_asset(self, assetUUID: str, deadline: Union[Deadline, float, None] = None):
         """
         Archive an asset in the Equiwatt SaaS platform.
 
         Args:
             assetUUID (str): The UUID of the asset to archive, this is different from the assetId.
+            deadline (Deadline | float, optional): The budget of the operation the request belongs to.
 
         Returns:
             True: If the asset is successfully archived.
         """
 
         url = f"{self.base_url}/api/v1/assets/{assetUUID}"
-        response = requests.delete(url, headers=self.headers)
+        response = self._request(
+            "DELETE", url, endpoint="/api/v1/assets/{uuid}", deadline=Deadline.coerce(deadline)
+        )
         if response.status_code != 200:
             raise EquiwattAPIException.from_response(response)
         return True
 
-    def get_scheme_list(self):
+    def _resolve_asset_uuids(self, asset_ids: Iterable[str], deadline: Optional[Deadline] = None) -> Dict[str, str]:
+        """
+        Map assetIds to asset UUIDs with a single walk over `get_assets`, stopping once all of them are found or
+        the deadline is spent.
+        """
+        wanted = set(asset_ids)
+        resolved = {}
+        try:
+            for assets in self.get_assets(chunk_size=500, deadline=deadline):
+                for asset in assets:
+                    if asset.assetId in wanted:
+                        resolved[asset.assetId] = asset.uuid
+                if len(resolved) == len(wanted):
+                    break
+        except DeadlineExceeded:
+            pass
+        return resolved
+
+    def _bulk_asset_call(
+        self,
+        fn: Callable[[str, Optional[Deadline]], T],
+        assets: Iterable[str],
+        by: str,
+        max_workers: int,
+        retries: int,
+        deadline: Union[Deadline, float, None],
+        gone: Optional[T] = None,
+    ) -> BatchResult[str, T]:
+        if by not in ("uuid", "assetId"):
+            raise EquiwattAPIException(f"Invalid asset identifier type: {by}")
+        deadline = Deadline.coerce(deadline)
+
+        def retry(asset_uuid: str) -> T:
+            # The attempt that timed out or failed may have been applied, so a 404 on a retry means it was.
+            try:
+                return fn(asset_uuid, deadline)
+            except EquiwattAPIException as e:
+                if e.status_code == 404:
+                    return gone
+                raise
+
+        call = with_retries(
+            lambda asset_uuid: fn(asset_uuid, deadline), retries=retries, deadline=deadline, retry_fn=retry
+        )
+        assets = list(dict.fromkeys(assets))
+        if by == "uuid":
+            return run_batch(call, assets, max_workers=max_workers, deadline=deadline)
+
+        uuids = self._resolve_asset_uuids(assets, deadline=deadline)
+        found = run_batch(call, uuids.values(), max_workers=max_workers, deadline=deadline)
+        result = BatchResult()
+        for asset_id in assets:
+            asset_uuid = uuids.get(asset_id)
+            if asset_uuid is None:
+                if deadline is not None and deadline.expired:
+                    result.errors[asset_id] = DeadlineExceeded("Deadline exceeded before the asset was resolved")
+                else:
+                    result.errors[asset_id] = EquiwattAPIException(f"Asset not found: {asset_id}")
+            elif asset_uuid in found.errors:
+                result.errors[asset_id] = found.errors[asset_uuid]
+            else:
+                result[asset_id] = found[asset_uuid]
+        return result
+
+    def archive_assets(
+        self,
+        assets: Iterable[str],
+        by: Literal["uuid", "assetId"] = "uuid",
+        max_workers: int = 8,
+        retries: int = 3,
+        deadline: Union[Deadline, float, None] = None,
+    ) -> BatchResult[str, bool]:
+        """
+        Archive many assets concurrently.
+
+        Args:
+            assets (Iterable[str]): The asset UUIDs, or assetIds when `by` is "assetId".
+            by (str, optional): "uuid" or "assetId". AssetIds are resolved with one pass over `get_assets`.
+                Defaults to "uuid".
+            max_workers (int, optional): The number of requests in flight. Defaults to 8.
+            retries (int, optional): The number of retries of throttled, failed or dropped requests. Defaults to 3.
+            deadline (Deadline | float, optional): The budget of the whole batch, including retries.
+
+        Returns:
+            BatchResult[str, bool]: True for each archived asset, keyed by the identifiers passed in. Assets that
+                failed, were not found or ran out of the deadline are recorded in `errors`. A retry that finds the
+                asset gone counts as archived.
+        """
+        return self._bulk_asset_call(self.archive_asset, assets, by, max_workers, retries, deadline, gone=True)
+
+    def get_scheme_list(self, deadline: Union[Deadline, float, None] = None):
         """
         Get the list of allowed event schemes.
 
@@ -191,10 +559,7 @@ class EquiwattSaaSClient:
             Dict: The response from the API as a dictionary.
         """
         url = f"{self.base_url}/api/v1/event-schemes"
-        response = requests.get(url, headers=self.headers)
-        if response.status_code != 200:
-            raise EquiwattAPIException.from_response(response)
-        return response.json()
+        return self._coalesced_get(url, "/api/v1/event-schemes", lambda data: data, Deadline.coerce(deadline))
 
     def create_user(self, user_id: str):
         """
@@ -205,7 +570,7 @@ class EquiwattSaaSClient:
         """
         url = f"{self.base_url}/api/v1/users"
         payload = {"userId": user_id}
-        response = requests.post(url, headers=self.headers, json=payload)
+        response = self._request("POST", url, endpoint="/api/v1/users", json=payload)
         if response.status_code != 201:
             raise EquiwattAPIException.from_response(response)
         return response.json()
@@ -225,7 +590,7 @@ class EquiwattSaaSClient:
             EquiwattAPIException: If there is an error in retrieving the webhooks or if the API call fails.
         """
         url = f"{self.base_url}/api/v1/webhooks?page={page}&pageSize={items_per_page}"
-        response = requests.get(url, headers=self.headers)
+        response = self._request("GET", url, endpoint="/api/v1/webhooks")
         if response.status_code != 200:
             raise EquiwattAPIException.from_response(response)
 
@@ -241,7 +606,7 @@ class EquiwattSaaSClient:
         """
         payload = {"name": name, "url": url, "eventTypes": eventTypes}
         url = f"{self.base_url}/api/v1/webhooks/subscribe"
-        response = requests.post(url, headers=self.headers, json=payload)
+        response = self._request("POST", url, endpoint="/api/v1/webhooks/subscribe", json=payload)
         if response.status_code != 201:
             raise EquiwattAPIException.from_response(response)
         return response.json()
@@ -254,119 +619,110 @@ class EquiwattSaaSClient:
             True: If the webhook is successfully deleted.
         """
         url = f"{self.base_url}/api/v1/webhooks/{webhook_uuid}/unsubscribe"
-        response = requests.delete(url, headers=self.headers)
+        response = self._request("DELETE", url, endpoint="/api/v1/webhooks/{uuid}/unsubscribe")
         if response.status_code != 200:
             raise EquiwattAPIException.from_response(response)
         return True
 
-    def get_event_details(self, event_uuid: str) -> EventDetails:
+    def get_event_details(self, event_uuid: str, deadline: Union[Deadline, float, None] = None) -> EventDetails:
         """
         Get event details
 
         Returns:
-            True: If the webhook is successfully deleted.
+            EventDetails: The details of the event.
         """
         url = f"{self.base_url}/api/v1/events/{event_uuid}"
-        response = requests.get(url, headers=self.headers)
-        if response.status_code != 200:
-            raise EquiwattAPIException.from_response(response)
-        return EventDetails(response.json())
+        return self._coalesced_get(url, "/api/v1/events/{uuid}", EventDetails, Deadline.coerce(deadline))
 
     def _get_paginated_event_assets(
-        self, event_uuid: str, page: int = 1, items_per_page: int = 100
+        self, event_uuid: str, page: int = 1, items_per_page: int = 100, deadline: Optional[Deadline] = None
     ) -> PowerResponsePaginatedResponse[EventAssetState]:
         """
         Get event details
 
         """
         url = f"{self.base_url}/api/v1/events/{event_uuid}/assets?page={page}&pageSize={items_per_page}"
-        response = requests.get(url, headers=self.headers)
-        if response.status_code != 200:
-            raise EquiwattAPIException.from_response(response)
-        data = response.json()
-        return PowerResponsePaginatedResponse[EventAssetState](EventAssetState, **data)
+        return self._get_page(url, "/api/v1/events/{uuid}/assets", EventAssetState, deadline)
 
-    def get_event_assets(self, event_uuid: str, chunk_size: int = 100) -> Iterator[List[EventAssetState]]:
+    def get_event_assets(
+        self, event_uuid: str, chunk_size: int = 100, deadline: Union[Deadline, float, None] = None
+    ) -> Iterator[List[EventAssetState]]:
         """
         This is a generator function that yields a list of assets registered in the powerResponse platform.
 
         Args:
             chunk_size (int, optional): The number of items per chunk. Defaults to 100.
+            deadline (Deadline | float, optional): The budget of the whole walk, in seconds from the first page. Raises
+                `DeadlineExceeded` once spent, after yielding the pages fetched in time.
         """
-        page = 1
-        while True:
-            paginated_response = self._get_paginated_event_assets(
-                event_uuid=event_uuid, page=page, items_per_page=chunk_size
-            )
-            yield paginated_response.items
-            if paginated_response.pagination.currentPage >= paginated_response.pagination.totalPages:
-                break
-            page += 1
+        deadline = Deadline.coerce(deadline)
+        yield from self._paginate(
+            lambda page, page_size: self._get_paginated_event_assets(event_uuid, page, page_size, deadline),
+            chunk_size,
+            "/api/v1/events/{uuid}/assets",
+        )
 
     def _get_paginated_event_asset_baselines(
-        self, event_uuid: str, page: int = 1, items_per_page: int = 100
+        self, event_uuid: str, page: int = 1, items_per_page: int = 100, deadline: Optional[Deadline] = None
     ) -> PowerResponsePaginatedResponse[EventAssetBaseline]:
         """
         Get event asset baselines
         """
         url = f"{self.base_url}/api/v1/events/{event_uuid}/baselines?page={page}&pageSize={items_per_page}"
-        response = requests.get(url, headers=self.headers)
-        if response.status_code != 200:
-            raise EquiwattAPIException.from_response(response)
-        data = response.json()
-        return PowerResponsePaginatedResponse[EventAssetBaseline](EventAssetBaseline, **data)
+        return self._get_page(url, "/api/v1/events/{uuid}/baselines", EventAssetBaseline, deadline)
 
-    def get_event_asset_baselines(self, event_uuid: str, chunk_size: int = 100) -> Iterator[List[EventAssetBaseline]]:
+    def get_event_asset_baselines(
+        self, event_uuid: str, chunk_size: int = 100, deadline: Union[Deadline, float, None] = None
+    ) -> Iterator[List[EventAssetBaseline]]:
         """
         This is a generator function that yields a list of assets registered in the powerResponse platform.
 
         Args:
             chunk_size (int, optional): The number of items per chunk. Defaults to 100.
+            deadline (Deadline | float, optional): The budget of the whole walk, in seconds from the first page. Raises
+                `DeadlineExceeded` once spent, after yielding the pages fetched in time.
         """
-        page = 1
-        while True:
-            paginated_response = self._get_paginated_event_asset_baselines(
-                event_uuid=event_uuid, page=page, items_per_page=chunk_size
-            )
-            yield paginated_response.items
-            if paginated_response.pagination.currentPage >= paginated_response.pagination.totalPages:
-                break
-            page += 1
+        deadline = Deadline.coerce(deadline)
+        yield from self._paginate(
+            lambda page, page_size: self._get_paginated_event_asset_baselines(event_uuid, page, page_size, deadline),
+            chunk_size,
+            "/api/v1/events/{uuid}/baselines",
+        )
 
     def _get_paginated_event_assets_with_baselines(
-        self, event_uuid: str, page: int = 1, items_per_page: int = 100
+        self, event_uuid: str, page: int = 1, items_per_page: int = 100, deadline: Optional[Deadline] = None
     ) -> PowerResponsePaginatedResponse[EventAssetDetails]:
         """
         Get event asset baselines
         """
         url = f"{self.base_url}/api/events/{event_uuid}/assets?page={page}&pageSize={items_per_page}"
-        response = requests.get(url, headers=self.headers)
-        if response.status_code != 200:
-            raise EquiwattAPIException.from_response(response)
-        data = response.json()
-        return PowerResponsePaginatedResponse[EventAssetDetails](EventAssetDetails, **data)
+        return self._get_page(url, "/api/events/{uuid}/assets", EventAssetDetails, deadline)
 
-    def get_event_assets_with_baselines(self, event_uuid: str, chunk_size: int = 100) -> Iterator[List[EventAssetDetails]]:
+    def get_event_assets_with_baselines(
+        self, event_uuid: str, chunk_size: int = 100, deadline: Union[Deadline, float, None] = None
+    ) -> Iterator[List[EventAssetDetails]]:
         """
         This is a generator function that yields a list of assets registered in the powerResponse platform.
 
         Args:
             chunk_size (int, optional): The number of items per chunk. Defaults to 100.
+            deadline (Deadline | float, optional): The budget of the whole walk, in seconds from the first page. Raises
+                `DeadlineExceeded` once spent, after yielding the pages fetched in time.
         """
-        page = 1
-        while True:
-            paginated_response = self._get_paginated_event_assets_with_baselines(
-                event_uuid=event_uuid, page=page, items_per_page=chunk_size
-            )
-            yield paginated_response.items
-            if paginated_response.pagination.currentPage >= paginated_response.pagination.totalPages:
-                break
-            page += 1
+        deadline = Deadline.coerce(deadline)
+        yield from self._paginate(
+            lambda page, page_size: self._get_paginated_event_assets_with_baselines(event_uuid, page, page_size, deadline),
+            chunk_size,
+            "/api/events/{uuid}/assets",
+        )
 
     def event_asset_opt_in(self, event_uuid: str, asset_uuids: List[str], status: str):
         """
         Opt in or out of an event
         """
+        from pydantic import ValidationError
+        from .schema.asset import EventAssetOptPayload, EventAssetOptPayloadStatus
+
         try:
             payloadStatus = EventAssetOptPayloadStatus(assetUUIDs=asset_uuids, status=status)
             payload = EventAssetOptPayload(statuses=[payloadStatus])
@@ -374,7 +730,7 @@ class EquiwattSaaSClient:
             raise EquiwattAPIException(f"Invalid payload data: {e.json()}")
 
         url = f"{self.base_url}/api/v1/events/{event_uuid}/asset-optin"
-        response = requests.post(url, json=payload.model_dump(), headers=self.headers)
+        response = self._request("POST", url, endpoint="/api/v1/events/{uuid}/asset-optin", json=payload.model_dump())
         if response.status_code != 201:
             raise EquiwattAPIException.from_response(response)
         return response.json()
@@ -384,6 +740,9 @@ class EquiwattSaaSClient:
         Opt in or out a list of assets to/from a scheme
         states = ["OPT_IN", "OPT_OUT"]
         """
+        from pydantic import ValidationError
+        from .schema.asset import EventAssetOptPayload, EventAssetOptPayloadStatus
+
         try:
             payloadStatus = EventAssetOptPayloadStatus(assetUUIDs=asset_uuids, status=status)
             payload = EventAssetOptPayload(statuses=[payloadStatus])
@@ -391,13 +750,18 @@ class EquiwattSaaSClient:
             raise EquiwattAPIException(f"Invalid payload data: {e.json()}")
 
         url = f"{self.base_url}/api/v1/event-schemes/{scheme_uuid}/assets-optin"
-        response = requests.post(url, json=payload.model_dump(), headers=self.headers)
+        response = self._request("POST", url, endpoint="/api/v1/event-schemes/{uuid}/assets-optin", json=payload.model_dump())
         if response.status_code != 201:
             raise EquiwattAPIException.from_response(response)
         return response.json()
 
     def _get_paginated_scheme_assets(
-        self, scheme_uuid: str, status: str, page: int = 1, items_per_page: int = 100
+        self,
+        scheme_uuid: str,
+        status: str,
+        page: int = 1,
+        items_per_page: int = 100,
+        deadline: Optional[Deadline] = None,
     ) -> PowerResponsePaginatedResponse[EventAssetState]:
         """
         Get scheme assets for a specific scheme and status.
@@ -408,6 +772,7 @@ class EquiwattSaaSClient:
                 ['OPT_IN', 'OPT_OUT', 'DUPLICATED', 'REJECTED', 'READY'].
             page (int, optional): The page number to retrieve. Defaults to 1.
             items_per_page (int, optional): The number of items per page. Defaults to 100.
+            deadline (Deadline, optional): The budget of the operation the request belongs to.
 
         Returns:
             PowerResponsePaginatedResponse[EventAssetState]: A paginated response containing 
@@ -416,13 +781,11 @@ class EquiwattSaaSClient:
         url = f"{self.base_url}/api/v1/event-schemes/{scheme_uuid}/assets?page={page}&pageSize={items_per_page}"
         if status:
             url += f"&state={status}"
-        response = requests.get(url, headers=self.headers)
-        if response.status_code != 200:
-            raise EquiwattAPIException.from_response(response)
-        data = response.json()
-        return PowerResponsePaginatedResponse[EventAssetState](EventAssetState, **data)
+        return self._get_page(url, "/api/v1/event-schemes/{uuid}/assets", EventAssetState, deadline)
 
-    def scheme_assets(self, scheme_uuid: str, status: str, chunk_size: int = 100) -> Iterator[List[EventAssetState]]:
+    def scheme_assets(
+        self, scheme_uuid: str, status: str, chunk_size: int = 100, deadline: Union[Deadline, float, None] = None
+    ) -> Iterator[List[EventAssetState]]:
         """
         This is a generator function that yields a list of scheme assets.
 
@@ -430,34 +793,43 @@ class EquiwattSaaSClient:
             scheme_uuid (str): The UUID of the scheme.
             status (str): The status of the assets to retrieve.
             chunk_size (int, optional): The number of items per chunk. Defaults to 100.
+            deadline (Deadline | float, optional): The budget of the whole walk, in seconds from the first page. Raises
+                `DeadlineExceeded` once spent, after yielding the pages fetched in time.
 
         Returns:
             Iterator[List[EventAssetState]]: A generator that yields lists of `EventAssetState` items, 
             one list per page of results.
         """
-        page = 1
-        while True:
-            paginated_response = self._get_paginated_scheme_assets(
-                scheme_uuid=scheme_uuid, status=status, page=page, items_per_page=chunk_size
-            )
-            yield paginated_response.items
-            if paginated_response.pagination.currentPage >= paginated_response.pagination.totalPages:
-                break
-            page += 1
+        deadline = Deadline.coerce(deadline)
+        yield from self._paginate(
+            lambda page, page_size: self._get_paginated_scheme_assets(scheme_uuid, status, page, page_size, deadline),
+            chunk_size,
+            "/api/v1/event-schemes/{uuid}/assets",
+        )
 
     # Energy data
 
-    def send_energy_readings(self, readings: List[EnergyConsumptionDataPoint]):
+    def send_energy_readings(
+        self, readings: List["EnergyConsumptionDataPoint"], deadline: Union[Deadline, float, None] = None
+    ):
         """
         Send energy readings to the Equiwatt powerResponse platform
+
+        Args:
+            readings (List[EnergyConsumptionDataPoint]): The readings to send.
+            deadline (Deadline | float, optional): The budget of the upload.
         """
+        from pydantic import ValidationError
+
         try:
             payload = [reading.model_dump() for reading in readings]
         except ValidationError as e:
             raise EquiwattAPIException(f"Invalid payload data: {e.json()}")
 
         url = f"{self.base_url}/api/v1/energy-consumption"
-        response = requests.post(url, json=payload, headers=self.headers)
+        response = self._request(
+            "POST", url, endpoint="/api/v1/energy-consumption", deadline=Deadline.coerce(deadline), json=payload
+        )
         if response.status_code != 201:
             raise EquiwattAPIException.from_response(response)
         return response.json()
@@ -479,7 +851,7 @@ class EquiwattSaaSClient:
         Return tariff connect URL for asset.
         """
         url = f"{self.base_url}/api/assets/{asset_uuid}/tariff/connect/{direction}"
-        response = requests.get(url, headers=self.headers)
+        response = self._request("GET", url, endpoint="/api/assets/{uuid}/tariff/connect/{direction}")
         if response.status_code != 200:
             raise EquiwattAPIException.from_response(response)
 
@@ -496,7 +868,7 @@ class EquiwattSaaSClient:
             "callbackURL": callback_url,
             "state": callback_state, 
         }
-        response = requests.post(url, headers=self.headers, json=data)
+        response = self._request("POST", url, endpoint="/api/assets/{uuid}/tariff-connect", json=data)
         if response.status_code != 200:
             raise EquiwattAPIException.from_response(response)
 
@@ -508,31 +880,66 @@ class EquiwattSaaSClient:
         Return asset tariffs
         """
         url = f"{self.base_url}/api/assets/{asset_uuid}/tariff/{direction}?page={page}&pageSize={page_size}"
-        response = requests.get(url, headers=self.headers)
+        response = self._request("GET", url, endpoint="/api/assets/{uuid}/tariff/{direction}")
         if response.status_code != 200:
             raise EquiwattAPIException.from_response(response)
 
         data = response.json()
         return data
 
-    def disconnect_asset_tariffs(self, asset_uuid: str, direction: str = "import") -> str:
+    def disconnect_asset_tariffs(
+        self, asset_uuid: str, direction: str = "import", deadline: Union[Deadline, float, None] = None
+    ) -> str:
         """
         Disconnect asset tariff.
         """
         url = f"{self.base_url}/api/assets/{asset_uuid}/tariff/{direction}"
-        response = requests.delete(url, headers=self.headers)
+        response = self._request(
+            "DELETE", url, endpoint="/api/assets/{uuid}/tariff/{direction}", deadline=Deadline.coerce(deadline)
+        )
         if response.status_code != 200:
             raise EquiwattAPIException.from_response(response)
 
         data = response.json()
         return data
 
+    def disconnect_assets_tariffs(
+        self,
+        assets: Iterable[str],
+        direction: str = "import",
+        by: Literal["uuid", "assetId"] = "uuid",
+        max_workers: int = 8,
+        retries: int = 3,
+        deadline: Union[Deadline, float, None] = None,
+    ) -> BatchResult[str, Dict]:
+        """
+        Disconnect the tariffs of many assets concurrently.
+
+        Args:
+            assets (Iterable[str]): The asset UUIDs, or assetIds when `by` is "assetId".
+            direction (str, optional): The tariff direction. Defaults to "import".
+            by (str, optional): "uuid" or "assetId". AssetIds are resolved with one pass over `get_assets`.
+                Defaults to "uuid".
+            max_workers (int, optional): The number of requests in flight. Defaults to 8.
+            retries (int, optional): The number of retries of throttled, failed or dropped requests. Defaults to 3.
+            deadline (Deadline | float, optional): The budget of the whole batch, including retries.
+
+        Returns:
+            BatchResult[str, Dict]: The response of each disconnected asset, keyed by the identifiers passed in.
+                Assets that failed, were not found or ran out of the deadline are recorded in `errors`. A retry that
+                gets a 404 counts as disconnected, with a None response.
+        """
+        def disconnect(asset_uuid: str, deadline: Optional[Deadline]):
+            return self.disconnect_asset_tariffs(asset_uuid, direction=direction, deadline=deadline)
+
+        return self._bulk_asset_call(disconnect, assets, by, max_workers, retries, deadline)
+
     def get_asset_tariff_plans(self, asset_uuid: str):
         """
         Return asset tariff plans
         """
         url = f"{self.base_url}/api/assets/{asset_uuid}/tariff-plans"
-        response = requests.get(url, headers=self.headers)
+        response = self._request("GET", url, endpoint="/api/assets/{uuid}/tariff-plans")
         if response.status_code != 200:
             raise EquiwattAPIException.from_response(response)
 
@@ -547,7 +954,7 @@ class EquiwattSaaSClient:
             raise EquiwattAPIException(f"Invalid tariff schedule type: {tariff_type}")
 
         url = f"{self.base_url}/api/assets/{asset_uuid}/tariff/schedules/{tariff_type}"
-        response = requests.post(url, headers=self.headers)
+        response = self._request("POST", url, endpoint="/api/assets/{uuid}/tariff/schedules/{type}")
         if response.status_code != 200:
             raise EquiwattAPIException.from_response(response)
 
@@ -562,7 +969,7 @@ class EquiwattSaaSClient:
             raise EquiwattAPIException(f"Invalid tariff schedule type: {tariff_type}")
 
         url = f"{self.base_url}/api/assets/{asset_uuid}/tariff/schedules/{tariff_type}/refresh"
-        response = requests.get(url, headers=self.headers)
+        response = self._request("GET", url, endpoint="/api/assets/{uuid}/tariff/schedules/{type}/refresh")
         if response.status_code != 200:
             raise EquiwattAPIException.from_response(response)
 
@@ -574,7 +981,7 @@ class EquiwattSaaSClient:
         Return asset tariff schedules
         """
         url = f"{self.base_url}/api/assets/{asset_uuid}/tariff/schedules/{tariff_type}?page={page}&pageSize={page_size}"
-        response = requests.get(url, headers=self.headers)
+        response = self._request("GET", url, endpoint="/api/assets/{uuid}/tariff/schedules/{type}")
         if response.status_code != 200:
             raise EquiwattAPIException.from_response(response)
 
@@ -583,43 +990,216 @@ class EquiwattSaaSClient:
 
 
     def _get_paginated_event_asset_stat(
-        self, event_uuid: str, page: int = 1, items_per_page: int = 200
+        self, event_uuid: str, page: int = 1, items_per_page: int = 200, deadline: Optional[Deadline] = None
     ) -> PowerResponsePaginatedResponse[EventAssetStat]:
         """
         Get stats of assets for an event.
         """
 
         url = f"{self.base_url}/api/v1/events/{event_uuid}/assets/stats?page={page}&pageSize={items_per_page}"
-        response = requests.get(url, headers=self.headers)
-        if response.status_code != 200:
-            raise EquiwattAPIException.from_response(response)
-
-        data = response.json()
-        return PowerResponsePaginatedResponse[EventAssetStat](EventAssetStat, **data)
+        return self._get_page(url, "/api/v1/events/{uuid}/assets/stats", EventAssetStat, deadline)
 
 
-    def get_event_asset_stats(self, event_uuid: str, chunk_size: int = 200) -> Iterator[List[EventAssetStat]]:
+    def get_event_asset_stats(
+        self, event_uuid: str, chunk_size: int = 200, deadline: Union[Deadline, float, None] = None
+    ) -> Iterator[List[EventAssetStat]]:
         """
         This is a generator function that yields a list of event asset stats of an event
 
         Args:
             chunk_size (int, optional): The number of items per chunk. Defaults to 200.
+            deadline (Deadline | float, optional): The budget of the whole walk, in seconds from the first page. Raises
+                `DeadlineExceeded` once spent, after yielding the pages fetched in time.
         """
-        page = 1
-        while True:
-            paginated_response = self._get_paginated_event_asset_stat(event_uuid=event_uuid, page=page, items_per_page=chunk_size)
-            yield paginated_response.items
-            if paginated_response.pagination.currentPage >= paginated_response.pagination.totalPages:
-                break
-            page += 1
+        deadline = Deadline.coerce(deadline)
+        yield from self._paginate(
+            lambda page, page_size: self._get_paginated_event_asset_stat(event_uuid, page, page_size, deadline),
+            chunk_size,
+            "/api/v1/events/{uuid}/assets/stats",
+        )
 
 
-    def get_event_stats(self, event_uuid: str) -> EventStats:
+    def get_event_stats(self, event_uuid: str, deadline: Union[Deadline, float, None] = None) -> EventStats:
         """
         Get event stats
         """
         url = f"{self.base_url}/api/v1/events/{event_uuid}/stats"
-        response = requests.get(url, headers=self.headers)
-        if response.status_code != 200:
-            raise EquiwattAPIException.from_response(response)
-        return EventStats(response.json())
\ No newline at end of file
+        return self._coalesced_get(url, "/api/v1/events/{uuid}/stats", EventStats, Deadline.coerce(deadline))
+
+    def get_events_details(
+        self, event_uuids: List[str], max_workers: int = 8, deadline: Union[Deadline, float, None] = None
+    ) -> BatchResult[str, EventDetails]:
+        """
+        Get the details of many events concurrently.
+
+        Args:
+            event_uuids (List[str]): The UUIDs of the events.
+            max_workers (int, optional): The number of requests in flight. Defaults to 8.
+            deadline (Deadline | float, optional): The budget of the whole batch.
+
+        Returns:
+            BatchResult[str, EventDetails]: The details by event UUID. Events that failed or did not finish before
+                the deadline are recorded in `errors` instead of failing the batch.
+        """
+        deadline = Deadline.coerce(deadline)
+        return run_batch(
+            lambda event_uuid: self.get_event_details(event_uuid, deadline=deadline),
+            event_uuids,
+            max_workers=max_workers,
+            deadline=deadline,
+        )
+
+    def get_events_stats(
+        self, event_uuids: List[str], max_workers: int = 8, deadline: Union[Deadline, float, None] = None
+    ) -> BatchResult[str, EventStats]:
+        """
+        Get the stats of many events concurrently.
+
+        Args:
+            event_uuids (List[str]): The UUIDs of the events.
+            max_workers (int, optional): The number of requests in flight. Defaults to 8.
+            deadline (Deadline | float, optional): The budget of the whole batch.
+
+        Returns:
+            BatchResult[str, EventStats]: The stats by event UUID. Events that failed or did not finish before the
+                deadline are recorded in `errors` instead of failing the batch.
+        """
+        deadline = Deadline.coerce(deadline)
+        return run_batch(
+            lambda event_uuid: self.get_event_stats(event_uuid, deadline=deadline),
+            event_uuids,
+            max_workers=max_workers,
+            deadline=deadline,
+        )
+
+    # Columnar exports
+
+    def export_assets(
+        self,
+        path: str,
+        fmt: str = "auto",
+        page_size: int = 500,
+        buffer_rows: Optional[int] = None,
+        deadline: Union[Deadline, float, None] = None,
+    ) -> int:
+        """
+        Stream all assets straight from the API pages into a Parquet, Arrow IPC or CSV file.
+
+        Args:
+            path (str): The output file.
+            fmt (str, optional): "parquet", "arrow", "csv" or "auto" to pick from the file extension, Parquet and
+                Arrow need pyarrow. Defaults to "auto".
+            page_size (int, optional): The number of items per page. Defaults to 500.
+            buffer_rows (int, optional): The number of rows buffered per write. Defaults to `page_size`.
+            deadline (Deadline | float, optional): The budget of the export.
+
+        Returns:
+            int: The number of rows written.
+        """
+        pages = self._get_raw_pages(
+            lambda page, size: f"{self.base_url}/api/v1/assets?page={page}&pageSize={size}",
+            "/api/v1/assets",
+            page_size,
+            Deadline.coerce(deadline),
+        )
+        return export_pages(pages, ASSET_COLUMNS, path, fmt=fmt, buffer_rows=buffer_rows or page_size)
+
+    def export_event_asset_stats(
+        self,
+        event_uuid: str,
+        path: str,
+        fmt: str = "auto",
+        page_size: int = 500,
+        buffer_rows: Optional[int] = None,
+        deadline: Union[Deadline, float, None] = None,
+    ) -> int:
+        """
+        Stream the asset stats of an event straight from the API pages into a Parquet, Arrow IPC or CSV file.
+
+        Args:
+            event_uuid (str): The UUID of the event.
+            path (str): The output file.
+            fmt (str, optional): "parquet", "arrow", "csv" or "auto", see `export_assets`. Defaults to "auto".
+            page_size (int, optional): The number of items per page. Defaults to 500.
+            buffer_rows (int, optional): The number of rows buffered per write. Defaults to `page_size`.
+            deadline (Deadline | float, optional): The budget of the export.
+
+        Returns:
+            int: The number of rows written.
+        """
+        pages = self._get_raw_pages(
+            lambda page, size: f"{self.base_url}/api/v1/events/{event_uuid}/assets/stats?page={page}&pageSize={size}",
+            "/api/v1/events/{uuid}/assets/stats",
+            page_size,
+            Deadline.coerce(deadline),
+        )
+        return export_pages(pages, EVENT_ASSET_STAT_COLUMNS, path, fmt=fmt, buffer_rows=buffer_rows or page_size)
+
+    def export_event_assets_with_baselines(
+        self,
+        event_uuid: str,
+        path: str,
+        fmt: str = "auto",
+        page_size: int = 500,
+        buffer_rows: Optional[int] = None,
+        deadline: Union[Deadline, float, None] = None,
+    ) -> int:
+        """
+        Stream the assets and baselines of an event straight from the API pages into a Parquet, Arrow IPC or CSV
+        file, one row per asset baseline.
+
+        Args:
+            event_uuid (str): The UUID of the event.
+            path (str): The output file.
+            fmt (str, optional): "parquet", "arrow", "csv" or "auto", see `export_assets`. Defaults to "auto".
+            page_size (int, optional): The number of items per page. Defaults to 500.
+            buffer_rows (int, optional): The number of rows buffered per write. Defaults to `page_size`.
+            deadline (Deadline | float, optional): The budget of the export.
+
+        Returns:
+            int: The number of rows written.
+        """
+        pages = self._get_raw_pages(
+            lambda page, size: f"{self.base_url}/api/events/{event_uuid}/assets?page={page}&pageSize={size}",
+            "/api/events/{uuid}/assets",
+            page_size,
+            Deadline.coerce(deadline),
+        )
+        return export_pages(
+            pages, EVENT_ASSET_BASELINE_COLUMNS, path, fmt=fmt, buffer_rows=buffer_rows or page_size, rows=explode_baselines
+        )
+
+
+_default_client: Optional[EquiwattSaaSClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> EquiwattSaaSClient:
+    """
+    Return the process-wide client, built on first use from the `EQUIWATT_API_KEY`, `EQUIWATT_TENANT_ID` and,
+    optionally, `EQUIWATT_BASE_URL` environment variables. Short-lived workers that stay warm between
+    invocations, such as serverless functions, reuse it and its open connections instead of building a client
+    per invocation. Use `clone` to derive clients for other tenants.
+
+    Raises:
+        EquiwattAPIException: If the environment variables are missing or the tenant id is invalid.
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = EquiwattSaaSClient(
+                    os.environ.get("EQUIWATT_API_KEY", ""),
+                    os.environ.get("EQUIWATT_TENANT_ID", ""),
+                    base_url=os.environ.get("EQUIWATT_BASE_URL", ""),
+                )
+    return _default_client
+
+
+def set_default_client(client: Optional[EquiwattSaaSClient]):
+    """
+    Replace the client returned by `get_default_client`, or reset it with None.
+    """
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
@@ -0,0 +1,96 @@
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Hashable, Optional, TypeVar
+
+from .deadline import Deadline
+from .exceptions import DeadlineExceeded
+
+T = TypeVar('T')
+
+
+class _Flight():
+    def __init__(self):
+        self.future = Future()
+        self.done_at = None
+
+
+class SingleFlight():
+    """
+    SingleFlight collapses concurrent calls with the same key into one: the first caller runs the call and
+    every caller that arrives while it is in flight, or within `window` seconds after it succeeded, gets the
+    same result. Failures are handed to the callers already waiting but are never reused, except
+    `DeadlineExceeded`: the first caller running out of its own budget says nothing about the others, so they
+    run the call again.
+
+    Callers share the returned object, so it must not be modified.
+    """
+
+    def __init__(self, window: float = 0.0):
+        """
+        Args:
+            window (float, optional): Seconds a successful result is reused for. Defaults to 0, which only
+                shares calls that are in flight.
+        """
+        self.window = window
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def _expired(self, flight: _Flight, now: float) -> bool:
+        return flight.done_at is not None and now - flight.done_at >= self.window
+
+    def do(self, key: Hashable, fn: Callable[[], T], deadline: Optional[Deadline] = None) -> T:
+        """
+        Run `fn`, or wait for the call of the same key in flight.
+
+        Args:
+            key (Hashable): The key identical calls share.
+            fn (Callable[[], T]): The call.
+            deadline (Deadline, optional): The budget of this caller, also applied while waiting for another one.
+
+        Raises:
+            DeadlineExceeded: If the deadline is spent while waiting for the call in flight.
+        """
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None or self._expired(flight, now)
+                if leader:
+                    for stale_key in [k for k, f in self._flights.items() if self._expired(f, now)]:
+                        del self._flights[stale_key]
+                    flight = self._flights[key] = _Flight()
+            if leader:
+                break
+
+            try:
+                return flight.future.result(timeout=None if deadline is None else deadline.remaining())
+            except FutureTimeoutError:
+                raise DeadlineExceeded(f"Deadline of {deadline.seconds}s exceeded waiting for a shared call")
+            except DeadlineExceeded:
+                continue
+
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.future.set_exception(e)
+            raise
+        with self._lock:
+            if self.window > 0:
+                flight.done_at = time.monotonic()
+            elif self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.future.set_result(result)
+        return result
+
+    def forget(self, key: Hashable):
+        """
+        Drop the reusable result of a key, the next call runs again.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and flight.done_at is not None:
+                del self._flights[key]
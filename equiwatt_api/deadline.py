@@ -0,0 +1,58 @@
+import time
+from typing import Optional, Tuple, Union
+
+from .exceptions import DeadlineExceeded
+
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+
+class Deadline():
+    """
+    Deadline is a time budget shared by all requests of a multi-request operation, such as a paginated walk or a
+    batch. Each request gets the client timeouts capped to the remaining budget, and the operation stops with
+    `DeadlineExceeded` once the budget is spent.
+
+    Example:
+        deadline = Deadline(30)
+        for assets in client.get_assets(deadline=deadline):
+            ...
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def coerce(cls, value: Union["Deadline", float, None]) -> Optional["Deadline"]:
+        """
+        Accept a deadline or a number of seconds from now.
+        """
+        if value is None or isinstance(value, Deadline):
+            return value
+        return cls(value)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self, partial=None):
+        """
+        Raise `DeadlineExceeded` if the budget is spent.
+        """
+        if self.expired:
+            raise DeadlineExceeded(f"Deadline of {self.seconds}s exceeded", partial=partial)
+
+    def timeout(self, timeout: Union[float, Tuple[float, float], None] = DEFAULT_TIMEOUT) -> Tuple[float, float]:
+        """
+        Return the (connect, read) timeout of the next request, capped to the remaining budget.
+        """
+        self.check()
+        remaining = self.remaining()
+        if timeout is None:
+            return (remaining, remaining)
+        if not isinstance(timeout, tuple):
+            timeout = (timeout, timeout)
+        return (min(timeout[0], remaining), min(timeout[1], remaining))
@@ -27,3 +27,25 @@ class EquiwattAPIException(Exception):
             status_code=response.status_code,
             details=error_details
         )
+
+
+class CircuitOpenException(EquiwattAPIException):
+    """
+    Raised without calling the platform when the circuit breaker of an endpoint is open.
+    """
+
+    def __init__(self, endpoint: str, retry_after: float = None):
+        super().__init__(f"Circuit breaker open for {endpoint}", details="The endpoint is failing, the call was not sent")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(EquiwattAPIException):
+    """
+    Raised when an operation ran out of its deadline budget. `partial` holds what was completed, when the
+    operation can return partial results.
+    """
+
+    def __init__(self, message: str = "Deadline exceeded", partial=None):
+        super().__init__(message)
+        self.partial = partial
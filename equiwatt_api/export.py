@@ -0,0 +1,195 @@
+import csv
+import importlib
+import importlib.util
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .exceptions import EquiwattAPIException
+
+
+def _has_pyarrow() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _pyarrow():
+    # pyarrow is imported on the first columnar export only, it is slow to import.
+    pyarrow = importlib.import_module("pyarrow")
+    importlib.import_module("pyarrow.ipc")
+    importlib.import_module("pyarrow.parquet")
+    return pyarrow
+
+
+# (column name, type, getter) per dataset, types are "string", "float64" or "bool".
+Column = Tuple[str, str, Callable[[Dict], object]]
+
+
+def _get(*path: str) -> Callable[[Dict], object]:
+    def getter(item: Dict):
+        for key in path:
+            if item is None:
+                return None
+            item = item.get(key)
+        return item
+    return getter
+
+
+EVENT_ASSET_STAT_COLUMNS: List[Column] = [
+    ("asset.uuid", "string", _get("asset", "uuid")),
+    ("state", "string", _get("state")),
+    ("energyForecasted", "float64", _get("energyForecasted")),
+    ("energyConsumed", "float64", _get("energyConsumed")),
+    ("energySaved", "float64", _get("energySaved")),
+    ("energyExportForecasted", "float64", _get("energyExportForecasted")),
+    ("energyExportDelivered", "float64", _get("energyExportDelivered")),
+    ("energyForecastedStatic", "float64", _get("energyForecastedStatic")),
+]
+
+ASSET_COLUMNS: List[Column] = [
+    ("uuid", "string", _get("uuid")),
+    ("assetId", "string", _get("assetId")),
+    ("name", "string", _get("name")),
+    ("assetType", "string", _get("assetType")),
+    ("archived", "bool", _get("archived")),
+    ("installationDate", "string", _get("installationDate")),
+    ("createdAt", "string", _get("createdAt")),
+    ("updatedAt", "string", _get("updatedAt")),
+]
+
+# One row per baseline of each event asset.
+EVENT_ASSET_BASELINE_COLUMNS: List[Column] = [
+    ("asset.uuid", "string", _get("asset", "uuid")),
+    ("asset.assetId", "string", _get("asset", "assetId")),
+    ("baseline.type", "string", _get("baseline", "type")),
+    ("baseline.method", "string", _get("baseline", "method")),
+    ("baseline.value", "float64", _get("baseline", "value")),
+]
+
+
+def explode_baselines(items: List[Dict]) -> Iterator[Dict]:
+    for item in items:
+        for baseline in item.get("baselines") or [{}]:
+            yield {"asset": item.get("asset"), "baseline": baseline}
+
+
+def _float(value) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+_CONVERTERS = {
+    "string": lambda value: None if value is None else str(value),
+    "float64": _float,
+    "bool": lambda value: None if value is None else bool(value),
+}
+
+
+def resolve_format(path: str, fmt: str = "auto") -> str:
+    """
+    Pick the file format from `fmt`, or from the extension of `path` when `fmt` is "auto": Parquet for
+    `.parquet`, Arrow IPC for `.arrow`/`.feather`, CSV for `.csv`, otherwise Parquet when pyarrow is installed
+    and CSV when it is not.
+    """
+    if fmt == "auto":
+        lower = path.lower()
+        if lower.endswith(".csv"):
+            fmt = "csv"
+        elif lower.endswith((".arrow", ".feather", ".ipc")):
+            fmt = "arrow"
+        elif lower.endswith(".parquet") or _has_pyarrow():
+            fmt = "parquet"
+        else:
+            fmt = "csv"
+    if fmt not in ("parquet", "arrow", "csv"):
+        raise EquiwattAPIException(f"Invalid export format: {fmt}")
+    if fmt != "csv" and not _has_pyarrow():
+        raise EquiwattAPIException(f"pyarrow is required for {fmt} exports, install powerresponse_client[export]")
+    return fmt
+
+
+class _ArrowSink():
+    def __init__(self, path: str, fmt: str, columns: List[Column]):
+        self.pyarrow = pyarrow = _pyarrow()
+        types = {"string": pyarrow.string(), "float64": pyarrow.float64(), "bool": pyarrow.bool_()}
+        self.schema = pyarrow.schema([(name, types[kind]) for name, kind, _ in columns])
+        if fmt == "parquet":
+            self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+        else:
+            self.writer = pyarrow.ipc.new_file(path, self.schema)
+
+    def write(self, buffers: List[List]):
+        pyarrow = self.pyarrow
+        batch = pyarrow.record_batch(
+            [pyarrow.array(buffer, type=field.type) for buffer, field in zip(buffers, self.schema)],
+            schema=self.schema,
+        )
+        self.writer.write_batch(batch)
+
+    def close(self):
+        self.writer.close()
+
+
+class _CSVSink():
+    def __init__(self, path: str, columns: List[Column]):
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([name for name, _, _ in columns])
+
+    def write(self, buffers: List[List]):
+        self.writer.writerows(zip(*buffers))
+
+    def close(self):
+        self.file.close()
+
+
+def export_pages(
+    pages: Iterable[List[Dict]],
+    columns: List[Column],
+    path: str,
+    fmt: str = "auto",
+    buffer_rows: int = 1000,
+    rows: Callable[[List[Dict]], Iterable[Dict]] = iter,
+) -> int:
+    """
+    Write raw JSON pages to a columnar file. Values are appended to one buffer per column and flushed once
+    `buffer_rows` rows are buffered, so memory holds the current page and at most `buffer_rows` rows plus one
+    page, whatever the dataset size. If `pages` raises, the rows fetched so far are written before the file is
+    closed and the error is raised.
+
+    Args:
+        pages (Iterable[List[Dict]]): The raw items of each page.
+        columns (List[Column]): The name, type and getter of each column.
+        path (str): The output file.
+        fmt (str, optional): "parquet", "arrow", "csv" or "auto", see `resolve_format`. Defaults to "auto".
+        buffer_rows (int, optional): The number of rows written at once. Defaults to 1000.
+        rows (Callable, optional): Turns the items of a page into rows. Defaults to one row per item.
+
+    Returns:
+        int: The number of rows written.
+    """
+    fmt = resolve_format(path, fmt)
+    sink = _CSVSink(path, columns) if fmt == "csv" else _ArrowSink(path, fmt, columns)
+    getters = [(getter, _CONVERTERS[kind]) for _, kind, getter in columns]
+    buffers = [[] for _ in columns]
+    written = 0
+    try:
+        for items in pages:
+            for row in rows(items):
+                for buffer, (getter, convert) in zip(buffers, getters):
+                    buffer.append(convert(getter(row)))
+            if len(buffers[0]) >= buffer_rows:
+                chunk, buffers = buffers, [[] for _ in columns]
+                sink.write(chunk)
+                written += len(chunk[0])
+        if buffers[0] or not written:
+            chunk, buffers = buffers, [[] for _ in columns]
+            sink.write(chunk)
+            written += len(chunk[0])
+    except BaseException:
+        # Keep the rows fetched before the failure, the caller gets the error and knows the file is partial.
+        complete = min(len(buffer) for buffer in buffers)
+        if complete:
+            sink.write([buffer[:complete] for buffer in buffers])
+        raise
+    finally:
+        sink.close()
+    return written
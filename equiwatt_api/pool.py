@@ -0,0 +1,262 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .breaker import CircuitBreakerRegistry
+from .client import EquiwattSaaSClient
+from .coalesce import SingleFlight
+from .deadline import DEFAULT_TIMEOUT, Deadline
+from .exceptions import DeadlineExceeded, EquiwattAPIException
+
+
+class _TokenBucket():
+    """
+    Blocking token bucket allowing `rate` requests per second with bursts of up to `burst` requests.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self, deadline: Optional[Deadline] = None):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            if deadline is not None and wait >= deadline.remaining():
+                raise DeadlineExceeded(f"Deadline of {deadline.seconds}s exceeded waiting for the tenant rate limit")
+            time.sleep(wait)
+
+
+class _FairScheduler():
+    """
+    Hands out the shared connection slots round-robin between the tenants that are waiting for one, so a
+    tenant with a deep queue of requests only ever gets its turn and never starves the others.
+    """
+
+    def __init__(self, max_connections: int):
+        self.max_connections = max_connections
+        self.active_total = 0
+        self.active: Dict[str, int] = {}
+        self.waiting: Dict[str, int] = {}
+        self.limits: Dict[str, int] = {}
+        self.queue = deque()
+        self.cond = threading.Condition()
+
+    def register(self, tenant_id: str, max_concurrency: int):
+        with self.cond:
+            self.limits[tenant_id] = max_concurrency
+            self.active.setdefault(tenant_id, 0)
+            self.waiting.setdefault(tenant_id, 0)
+            self.cond.notify_all()
+
+    def _next_tenant(self) -> Optional[str]:
+        if self.active_total >= self.max_connections:
+            return None
+        for tenant_id in self.queue:
+            if self.active[tenant_id] < self.limits[tenant_id]:
+                return tenant_id
+        return None
+
+    def acquire(self, tenant_id: str, deadline: Optional[Deadline] = None):
+        with self.cond:
+            self.waiting[tenant_id] += 1
+            if tenant_id not in self.queue:
+                self.queue.append(tenant_id)
+            while self._next_tenant() != tenant_id:
+                if deadline is None:
+                    self.cond.wait()
+                    continue
+                remaining = deadline.remaining()
+                if remaining <= 0:
+                    self.waiting[tenant_id] -= 1
+                    if not self.waiting[tenant_id]:
+                        self.queue.remove(tenant_id)
+                    self.cond.notify_all()
+                    raise DeadlineExceeded(f"Deadline of {deadline.seconds}s exceeded waiting for a connection")
+                self.cond.wait(remaining)
+            self.waiting[tenant_id] -= 1
+            self.active[tenant_id] += 1
+            self.active_total += 1
+            # Move the tenant that just got a slot to the back of the rotation.
+            self.queue.remove(tenant_id)
+            if self.waiting[tenant_id]:
+                self.queue.append(tenant_id)
+            self.cond.notify_all()
+
+    def release(self, tenant_id: str):
+        with self.cond:
+            self.active[tenant_id] -= 1
+            self.active_total -= 1
+            self.cond.notify_all()
+
+
+class _TenantLimiter():
+    """
+    Holds a pooled client's rate and concurrency limits. `slot` is entered around each request.
+    """
+
+    def __init__(self, scheduler: _FairScheduler, tenant_id: str, bucket: Optional[_TokenBucket] = None):
+        self.scheduler = scheduler
+        self.tenant_id = tenant_id
+        self.bucket = bucket
+
+    @contextmanager
+    def slot(self, deadline: Optional[Deadline] = None):
+        """
+        Wait for the tenant's turn, raising `DeadlineExceeded` if the deadline is spent while waiting.
+        """
+        if self.bucket is not None:
+            self.bucket.take(deadline)
+        self.scheduler.acquire(self.tenant_id, deadline)
+        try:
+            yield
+        finally:
+            self.scheduler.release(self.tenant_id)
+
+
+class EquiwattClientPool():
+    """
+    EquiwattClientPool serves clients for several tenants from one process. All tenant clients send their
+    requests through a single `requests.Session`, so they share one connection pool, while each request still
+    carries its own tenant's `tenant` and `x-api-key` headers.
+
+    Every tenant has its own concurrency limit and an optional rate limit, and the shared connections are
+    handed out fairly between tenants, so a large backfill for one tenant cannot starve live calls of another.
+
+    Example:
+        pool = EquiwattClientPool(max_connections=20)
+        pool.add_tenant(tenant_a, api_key_a, max_concurrency=4)
+        pool.add_tenant(tenant_b, api_key_b, max_concurrency=16, rate_limit=50)
+        pool.client(tenant_a).get_event_details(event_uuid)
+    """
+
+    def __init__(
+        self,
+        base_url: str = "",
+        version: str = "1.0",
+        max_connections: int = 20,
+        breakers: Optional[CircuitBreakerRegistry] = None,
+        coalesce_window: Optional[float] = None,
+        timeout: Union[float, Tuple[float, float], None] = DEFAULT_TIMEOUT,
+    ):
+        """
+        Args:
+            base_url (str, optional): The platform URL used by every tenant client.
+            version (str, optional): The API version sent by every tenant client.
+            max_connections (int, optional): The number of connections shared by all tenants. Defaults to 20.
+            breakers (CircuitBreakerRegistry, optional): Circuit breakers shared by every tenant client.
+            coalesce_window (float, optional): Enables coalescing of identical concurrent GETs, see
+                `EquiwattSaaSClient`. Calls are only shared between callers of the same tenant and API key.
+            timeout (float | Tuple[float, float], optional): The (connect, read) timeout of every request.
+                Defaults to (5, 30).
+        """
+        if max_connections < 1:
+            raise EquiwattAPIException("max_connections must be at least 1")
+        self.base_url = base_url
+        self.version = version
+        self.max_connections = max_connections
+        self.breakers = breakers
+        self.timeout = timeout
+        self.single_flight = SingleFlight(coalesce_window) if coalesce_window is not None else None
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._scheduler = _FairScheduler(max_connections)
+        self._clients: Dict[str, EquiwattSaaSClient] = {}
+        self._lock = threading.Lock()
+
+    def enable_sandbox(self):
+        self.set_service_url("https://sandbox.equiwatt.com")
+
+    def set_service_url(self, url):
+        with self._lock:
+            self.base_url = url
+            for client in self._clients.values():
+                client.set_service_url(url)
+
+    def add_tenant(
+        self,
+        tenant_id: str,
+        api_key: str,
+        max_concurrency: int = 4,
+        rate_limit: Optional[float] = None,
+        burst: Optional[int] = None,
+    ) -> EquiwattSaaSClient:
+        """
+        Register a tenant with the pool, replacing its API key and limits if it is already registered.
+
+        Args:
+            tenant_id (str): The tenant UUID.
+            api_key (str): The API key of the tenant.
+            max_concurrency (int, optional): The maximum number of requests in flight for the tenant. Defaults to 4.
+            rate_limit (float, optional): The maximum number of requests per second for the tenant.
+            burst (int, optional): The number of requests allowed in a burst above `rate_limit`.
+
+        Returns:
+            EquiwattSaaSClient: The client of the tenant.
+
+        Raises:
+            EquiwattAPIException: If the tenant id, API key or limits are invalid.
+        """
+        if max_concurrency < 1:
+            raise EquiwattAPIException("max_concurrency must be at least 1")
+        if rate_limit is not None and rate_limit <= 0:
+            raise EquiwattAPIException("rate_limit must be positive")
+
+        bucket = _TokenBucket(rate_limit, burst) if rate_limit else None
+        limiter = _TenantLimiter(self._scheduler, tenant_id, bucket)
+        client = EquiwattSaaSClient(
+            api_key=api_key,
+            tenant_id=tenant_id,
+            base_url=self.base_url,
+            version=self.version,
+            session=self.session,
+            limiter=limiter,
+            breakers=self.breakers,
+            single_flight=self.single_flight,
+            timeout=self.timeout,
+        )
+        self._scheduler.register(tenant_id, max_concurrency)
+        with self._lock:
+            self._clients[tenant_id] = client
+        return client
+
+    def client(self, tenant_id: str) -> EquiwattSaaSClient:
+        """
+        Return the client of a registered tenant.
+
+        Raises:
+            EquiwattAPIException: If the tenant is not registered with the pool.
+        """
+        try:
+            return self._clients[tenant_id]
+        except KeyError:
+            raise EquiwattAPIException(f"Unknown tenant: {tenant_id}")
+
+    def tenants(self):
+        return list(self._clients)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
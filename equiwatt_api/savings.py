@@ -0,0 +1,217 @@
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Literal, Mapping, Optional, Sequence, Union
+
+from equiwatt_api.response import EventAssetBaseline, EventAssetDetails, EventDetails
+from .exceptions import EquiwattAPIException
+from .schema.asset import EnergyConsumptionDataPoint
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _require_numpy():
+    if np is None:
+        raise EquiwattAPIException("numpy is required for savings calculations, install powerresponse_client[analytics]")
+
+
+def _epoch_seconds(value: str) -> float:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _iter_flat(items: Iterable) -> Iterable:
+    # Accept both flat lists and the pages yielded by the paginated generators.
+    for item in items:
+        if isinstance(item, list):
+            yield from item
+        else:
+            yield item
+
+
+class ProvisionalSavings():
+    """
+    ProvisionalSavings holds the energy consumed and saved per asset over an event window, as aligned numpy
+    arrays. Assets without readings in the window have a NaN `saved` value.
+
+    Attributes:
+    ----------
+    asset_uuids : numpy.ndarray
+        The asset UUIDs.
+    baseline : numpy.ndarray
+        The baseline of each asset.
+    consumed : numpy.ndarray
+        The energy consumed by each asset over the event window.
+    saved : numpy.ndarray
+        `baseline - consumed`, NaN for assets without readings.
+    reading_counts : numpy.ndarray
+        The number of readings of each asset in the window.
+    """
+
+    def __init__(self, asset_uuids, baseline, consumed, reading_counts):
+        self.asset_uuids = asset_uuids
+        self.baseline = baseline
+        self.consumed = consumed
+        self.reading_counts = reading_counts
+        self.saved = np.where(reading_counts > 0, baseline - consumed, np.nan)
+        self._index = None
+
+    def __len__(self) -> int:
+        return len(self.asset_uuids)
+
+    @property
+    def total_saved(self) -> float:
+        return float(np.nansum(self.saved))
+
+    @property
+    def total_consumed(self) -> float:
+        return float(self.consumed.sum())
+
+    def __getitem__(self, asset_uuid: str) -> Dict[str, float]:
+        if self._index is None:
+            self._index = {asset: i for i, asset in enumerate(self.asset_uuids.tolist())}
+        i = self._index[asset_uuid]
+        return {
+            "baseline": float(self.baseline[i]),
+            "consumed": float(self.consumed[i]),
+            "saved": float(self.saved[i]),
+            "readings": int(self.reading_counts[i]),
+        }
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {
+            asset: {"baseline": baseline, "consumed": consumed, "saved": saved, "readings": count}
+            for asset, baseline, consumed, saved, count in zip(
+                self.asset_uuids.tolist(),
+                self.baseline.tolist(),
+                self.consumed.tolist(),
+                self.saved.tolist(),
+                self.reading_counts.tolist(),
+            )
+        }
+
+
+def _baseline_arrays(
+    baselines: Iterable[Union[EventAssetBaseline, EventAssetDetails]],
+    baseline_type: Optional[str],
+    baseline_method: Optional[str],
+):
+    # One baseline per asset: repeated rows with the same value are dropped, conflicting ones are an error.
+    values: Dict[str, float] = {}
+    for item in _iter_flat(baselines):
+        if isinstance(item, EventAssetDetails):
+            candidates = [
+                b for b in item.baselines
+                if (baseline_type is None or b.type == baseline_type)
+                and (baseline_method is None or b.method == baseline_method)
+            ]
+            if not candidates:
+                continue
+            value = candidates[0].value
+        else:
+            if baseline_method is not None and item.method != baseline_method:
+                continue
+            value = item.value
+        if value is None:
+            continue
+        value = float(value)
+        asset_uuid = item.asset.uuid
+        if asset_uuid in values and values[asset_uuid] != value:
+            raise EquiwattAPIException(
+                f"Asset {asset_uuid} has conflicting baselines, pass baseline_method to pick one"
+            )
+        values[asset_uuid] = value
+    return np.array(list(values), dtype=object), np.array(list(values.values()), dtype=np.float64)
+
+
+def _reading_columns(readings: Union[Iterable[EnergyConsumptionDataPoint], Mapping[str, Sequence]]):
+    if isinstance(readings, Mapping):
+        assets = np.asarray(readings["assetUUID"], dtype=object)
+        timestamps = np.asarray(readings["timestamp"], dtype=np.float64)
+        values = np.asarray(readings["value"], dtype=np.float64)
+        types = readings.get("type")
+        return assets, timestamps, values, None if types is None else np.asarray(types, dtype=object)
+
+    assets, timestamps, values, types = [], [], [], []
+    for reading in _iter_flat(readings):
+        if isinstance(reading, Mapping):
+            reading = EnergyConsumptionDataPoint.model_construct(**reading)
+        assets.append(reading.assetUUID)
+        timestamps.append(reading.timestamp)
+        values.append(reading.value)
+        types.append(reading.type)
+    return (
+        np.array(assets, dtype=object),
+        np.array(timestamps, dtype=np.float64),
+        np.array(values, dtype=np.float64),
+        np.array(types, dtype=object),
+    )
+
+
+def compute_provisional_savings(
+    event: EventDetails,
+    baselines: Iterable[Union[EventAssetBaseline, EventAssetDetails]],
+    readings: Union[Iterable[EnergyConsumptionDataPoint], Mapping[str, Sequence]],
+    reading_type: Optional[str] = "import",
+    baseline_type: Optional[str] = "import",
+    timestamp_unit: Literal["s", "ms"] = "s",
+    baseline_method: Optional[str] = None,
+) -> ProvisionalSavings:
+    """
+    Compute provisional energy consumed and saved per asset for an event, before the platform settles it.
+
+    Readings with a timestamp in `[startDateTime, endDateTime)` of the event are summed per asset and subtracted
+    from the asset baseline. All work after loading the inputs is vectorized, so hundreds of thousands of assets
+    take seconds.
+
+    Args:
+        event (EventDetails): The event, from `get_event_details`.
+        baselines (Iterable): `EventAssetBaseline` or `EventAssetDetails` items, or the pages yielded by
+            `get_event_asset_baselines`/`get_event_assets_with_baselines`.
+        readings (Iterable | Mapping): `EnergyConsumptionDataPoint` items or dicts of the same shape, or, fastest,
+            a mapping of columns `assetUUID`, `timestamp`, `value` and optionally `type`.
+        reading_type (str, optional): The reading type to count, None for all. Defaults to "import".
+        baseline_type (str, optional): The baseline type used for `EventAssetDetails`, None for the first one.
+            Defaults to "import".
+        timestamp_unit (str, optional): "s" or "ms", the unit of the reading timestamps. Defaults to "s".
+        baseline_method (str, optional): Only use baselines of this method. Needed when the assets have several
+            baselines, as `EventAssetBaseline` items carry no type. Defaults to None, for any method.
+
+    Returns:
+        ProvisionalSavings: The per-asset results, for the assets that have a baseline.
+
+    Raises:
+        EquiwattAPIException: If numpy is not installed, the event has no start or end time, or an asset has
+            several baselines with different values.
+    """
+    _require_numpy()
+    if not event.startDateTime or not event.endDateTime:
+        raise EquiwattAPIException(f"Event {event.uuid} has no start or end time")
+    scale = 1000.0 if timestamp_unit == "ms" else 1.0
+    start = _epoch_seconds(event.startDateTime) * scale
+    end = _epoch_seconds(event.endDateTime) * scale
+
+    asset_uuids, baseline = _baseline_arrays(baselines, baseline_type, baseline_method)
+    position = {asset: i for i, asset in enumerate(asset_uuids.tolist())}
+
+    assets, timestamps, values, types = _reading_columns(readings)
+    mask = (timestamps >= start) & (timestamps < end)
+    if reading_type is not None and types is not None:
+        mask &= types == reading_type
+    assets = assets[mask]
+    values = values[mask]
+
+    # Look up each distinct asset once, then map every reading through the inverse index.
+    unique_assets, inverse = np.unique(assets.astype(str), return_inverse=True)
+    unique_positions = np.fromiter(
+        (position.get(asset, -1) for asset in unique_assets.tolist()), dtype=np.int64, count=len(unique_assets)
+    )
+    reading_positions = unique_positions[inverse] if len(inverse) else np.empty(0, dtype=np.int64)
+    known = reading_positions >= 0
+    consumed = np.bincount(reading_positions[known], weights=values[known], minlength=len(asset_uuids))
+    counts = np.bincount(reading_positions[known], minlength=len(asset_uuids))
+
+    return ProvisionalSavings(asset_uuids, baseline, consumed.astype(np.float64), counts)
@@ -0,0 +1,266 @@
+import heapq
+import json
+import math
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import uuid
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from equiwatt_api.response import EventAssetStat, EventAssetState
+from .exceptions import EquiwattAPIException
+
+_STAT_FIELDS = (
+    "energyForecasted",
+    "energyConsumed",
+    "energySaved",
+    "energyExportForecasted",
+    "energyExportDelivered",
+    "energyForecastedStatic",
+)
+
+# asset uuid, state id, padding, energy values (NaN for missing)
+_STAT_RECORD = struct.Struct("<16sI4x6d")
+# asset uuid, assetId offset and length in the string heap, state id
+_STATE_RECORD = struct.Struct("<16sIII")
+# asset uuid, record number
+_INDEX_ENTRY = struct.Struct("<16sI")
+
+_KINDS = {"EventAssetStat": _STAT_RECORD, "EventAssetState": _STATE_RECORD}
+
+
+def _uuid_bytes(value: str) -> bytes:
+    try:
+        return uuid.UUID(value).bytes
+    except (TypeError, ValueError):
+        raise EquiwattAPIException(f"Invalid asset UUID: {value}")
+
+
+def _iter_entries(path: str) -> Iterator[tuple]:
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(_INDEX_ENTRY.size * 4096)
+            if not block:
+                return
+            yield from _INDEX_ENTRY.iter_unpack(block)
+
+
+class ResultStore():
+    """
+    ResultStore spills `EventAssetStat` or `EventAssetState` rows from a paginated generator to a fixed-width
+    record file on disk and reads them back through a memory map, so the rows can be scanned many times, read
+    by position and looked up by asset UUID while only the pages being touched are resident.
+
+    Asset UUIDs are stored as 16 bytes, states are interned in a small string table and assetIds are kept in a
+    string heap. A sorted UUID index is built with an external merge sort when the store is filled.
+
+    Example:
+        with ResultStore.fill(client.get_event_asset_stats(event_uuid)) as store:
+            saved = sum(stat.energySaved or 0 for stat in store)
+            stat = store.get(asset_uuid)
+    """
+
+    def __init__(self, path: str, owned: bool = False):
+        """
+        Open a store filled before. Use `ResultStore.fill` to create one.
+
+        Args:
+            path (str): The directory of the store.
+            owned (bool, optional): Whether to delete the directory on `close`. Defaults to False.
+        """
+        self.path = path
+        self.owned = owned
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        self.kind = meta["kind"]
+        self.states: List[str] = meta["states"]
+        self._record = _KINDS[self.kind]
+        self._count = meta["count"]
+        self._files = []
+        self._records = self._map("records.bin")
+        self._index = self._map("index.bin")
+        self._strings = self._map("strings.bin")
+
+    def _map(self, name: str) -> Optional[mmap.mmap]:
+        f = open(os.path.join(self.path, name), "rb")
+        self._files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    def fill(
+        cls,
+        pages: Iterable[Union[List[EventAssetStat], List[EventAssetState]]],
+        path: Optional[str] = None,
+        run_size: int = 262144,
+    ) -> "ResultStore":
+        """
+        Write the rows of a paginated generator to a new store.
+
+        Args:
+            pages (Iterable): The pages of `get_event_asset_stats`, `get_event_assets` or `scheme_assets`.
+            path (str, optional): The directory of the store, a temporary directory deleted on `close` by default.
+            run_size (int, optional): The number of index entries sorted in memory at once. Defaults to 262144.
+
+        Returns:
+            ResultStore: The store, open for reading.
+        """
+        owned = path is None
+        if owned:
+            path = tempfile.mkdtemp(prefix="equiwatt-store-")
+        else:
+            os.makedirs(path, exist_ok=True)
+
+        try:
+            cls._write(pages, path, run_size)
+        except BaseException:
+            if owned:
+                shutil.rmtree(path, ignore_errors=True)
+            raise
+        return cls(path, owned=owned)
+
+    @staticmethod
+    def _write(pages: Iterable, path: str, run_size: int):
+        kind = None
+        states: Dict[str, int] = {}
+        count = 0
+        heap_size = 0
+        run = []
+        runs = []
+
+        def state_id(state: Optional[str]) -> int:
+            # 0 is reserved for a missing state.
+            if state is None:
+                return 0
+            if state not in states:
+                states[state] = len(states) + 1
+            return states[state]
+
+        def flush_run():
+            run.sort()
+            run_path = os.path.join(path, f"run-{len(runs)}.bin")
+            with open(run_path, "wb") as f:
+                f.writelines(_INDEX_ENTRY.pack(*entry) for entry in run)
+            runs.append(run_path)
+            run.clear()
+
+        with open(os.path.join(path, "records.bin"), "wb") as records, \
+                open(os.path.join(path, "strings.bin"), "wb") as strings:
+            for page in pages:
+                for item in page:
+                    if kind is None:
+                        kind = type(item).__name__
+                        if kind not in _KINDS:
+                            raise EquiwattAPIException(f"Unsupported row type: {kind}")
+                    key = _uuid_bytes(item.asset.uuid)
+                    if kind == "EventAssetStat":
+                        values = [getattr(item, field) for field in _STAT_FIELDS]
+                        records.write(_STAT_RECORD.pack(
+                            key, state_id(item.state), *[math.nan if v is None else float(v) for v in values]
+                        ))
+                    else:
+                        asset_id = (item.asset.assetId or "").encode()
+                        strings.write(asset_id)
+                        records.write(_STATE_RECORD.pack(key, heap_size, len(asset_id), state_id(item.state)))
+                        heap_size += len(asset_id)
+                    run.append((key, count))
+                    count += 1
+                    if len(run) >= run_size:
+                        flush_run()
+        if run:
+            flush_run()
+
+        with open(os.path.join(path, "index.bin"), "wb") as index:
+            for entry in heapq.merge(*[_iter_entries(run_path) for run_path in runs]):
+                index.write(_INDEX_ENTRY.pack(*entry))
+        for run_path in runs:
+            os.remove(run_path)
+
+        meta = {
+            "kind": kind or "EventAssetStat",
+            "count": count,
+            "states": [None] + sorted(states, key=states.get),
+        }
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _decode(self, fields: tuple):
+        if self.kind == "EventAssetStat":
+            data = {"asset": {"uuid": str(uuid.UUID(bytes=fields[0]))}, "state": self.states[fields[1]]}
+            for field, value in zip(_STAT_FIELDS, fields[2:]):
+                data[field] = None if math.isnan(value) else value
+            return EventAssetStat(data)
+        key, offset, length, state = fields
+        asset_id = self._strings[offset:offset + length].decode() if length else None
+        return EventAssetState({
+            "asset": {"uuid": str(uuid.UUID(bytes=key)), "assetId": asset_id},
+            "state": self.states[state],
+        })
+
+    def __getitem__(self, position: int):
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+        return self._decode(self._record.unpack_from(self._records, position * self._record.size))
+
+    def __iter__(self) -> Iterator:
+        for chunk in self.scan():
+            yield from chunk
+
+    def scan(self, chunk_size: int = 1024) -> Iterator[List]:
+        """
+        Read all rows in order, `chunk_size` rows at a time. Each call starts a new pass.
+        """
+        size = self._record.size
+        for start in range(0, self._count, chunk_size):
+            end = min(self._count, start + chunk_size)
+            block = self._records[start * size:end * size]
+            yield [self._decode(fields) for fields in self._record.iter_unpack(block)]
+
+    def get(self, asset_uuid: str):
+        """
+        Look up the row of an asset by UUID with a binary search over the index.
+
+        Returns:
+            The row, or None if the asset is not in the store.
+        """
+        key = _uuid_bytes(asset_uuid)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            entry_key, position = _INDEX_ENTRY.unpack_from(self._index, middle * _INDEX_ENTRY.size)
+            if entry_key < key:
+                low = middle + 1
+            elif entry_key > key:
+                high = middle
+            else:
+                return self[position]
+        return None
+
+    def __contains__(self, asset_uuid: str) -> bool:
+        return self.get(asset_uuid) is not None
+
+    def close(self):
+        for mapped in (self._records, self._index, self._strings):
+            if mapped is not None:
+                mapped.close()
+        for f in self._files:
+            f.close()
+        self._files = []
+        self._records = self._index = self._strings = None
+        if self.owned:
+            shutil.rmtree(self.path, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,302 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from equiwatt_api.response import EventAssetStat, EventStats
+
+logger = logging.getLogger(__name__)
+
+
+class EventProgressUpdate():
+    """
+    EventProgressUpdate is sent to the subscribers of an event when its stats change.
+
+    Attributes:
+    ----------
+    event_uuid : str
+        The UUID of the event.
+    stats : EventStats
+        The latest stats of the event.
+    changed_assets : List[EventAssetStat]
+        The asset stats that are new or changed since the previous update.
+    finished : bool
+        True for the last update of the event, sent once it reached a final state.
+    """
+    event_uuid: str
+    stats: EventStats
+    changed_assets: List[EventAssetStat]
+    finished: bool
+
+    def __init__(self, event_uuid: str, stats: EventStats, changed_assets: List[EventAssetStat], finished: bool):
+        self.event_uuid = event_uuid
+        self.stats = stats
+        self.changed_assets = changed_assets
+        self.finished = finished
+
+
+class _WatchedEvent():
+    def __init__(self, event_uuid: str, interval: float):
+        self.event_uuid = event_uuid
+        self.interval = interval
+        self.subscribers: List[Callable[[EventProgressUpdate], None]] = []
+        self.error_handlers: List[Callable[[str, Exception], None]] = []
+        self.counts = None
+        self.asset_hashes: Dict[str, int] = {}
+
+
+def _stats_counts(stats: EventStats) -> tuple:
+    return (
+        stats.state,
+        stats.processedStatsAssetsCount,
+        stats.pendingStatsAssetsCount,
+        stats.expiredStatsAssetsCount,
+        stats.participatedAssetCount,
+        stats.optInCount,
+        stats.optOutCount,
+        stats.energySaved,
+    )
+
+
+def _asset_stat_hash(stat: EventAssetStat) -> int:
+    return hash((
+        stat.state,
+        stat.energyForecasted,
+        stat.energyConsumed,
+        stat.energySaved,
+        stat.energyExportForecasted,
+        stat.energyExportDelivered,
+        stat.energyForecastedStatic,
+    ))
+
+
+class EventProgressWatcher():
+    """
+    EventProgressWatcher tracks the settlement progress of many events on one shared scheduler.
+
+    Each event is polled with `get_event_stats`. When its counts change, the event asset stats are fetched and
+    only the new or changed asset stats are sent to the subscribers, and the event is polled more often. While
+    nothing changes the polling interval backs off up to `max_interval`. An event is dropped once its state is
+    one of `final_states` and no asset stats are pending.
+
+    Subscribers are called from the watcher's worker threads.
+
+    Example:
+        with EventProgressWatcher(client) as watcher:
+            watcher.watch(event_uuid, lambda update: print(update.stats.processedStatsAssetsCount))
+            watcher.wait()
+    """
+
+    def __init__(
+        self,
+        client,
+        min_interval: float = 5.0,
+        max_interval: float = 300.0,
+        backoff: float = 2.0,
+        max_workers: int = 4,
+        final_states: Iterable[str] = ("COMPLETED", "SETTLED", "CANCELLED"),
+        include_asset_stats: bool = True,
+    ):
+        """
+        Args:
+            client (EquiwattSaaSClient): The client used to poll the events.
+            min_interval (float, optional): The shortest polling interval in seconds. Defaults to 5.
+            max_interval (float, optional): The longest polling interval in seconds. Defaults to 300.
+            backoff (float, optional): The factor the interval grows by when nothing changed and shrinks by when
+                the counts changed. Defaults to 2.
+            max_workers (int, optional): The number of events polled at the same time. Defaults to 4.
+            final_states (Iterable[str], optional): The event stats states that end the watch.
+            include_asset_stats (bool, optional): Whether to send changed asset stats with the updates.
+                Defaults to True.
+        """
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_workers = max_workers
+        self.final_states = set(final_states)
+        self.include_asset_stats = include_asset_stats
+        self._events: Dict[str, _WatchedEvent] = {}
+        self._schedule = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def watch(
+        self,
+        event_uuid: str,
+        callback: Callable[[EventProgressUpdate], None],
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ):
+        """
+        Subscribe to the progress of an event, starting to poll it if it is not watched yet.
+
+        Args:
+            event_uuid (str): The UUID of the event.
+            callback (Callable[[EventProgressUpdate], None]): Called with each update of the event.
+            on_error (Callable[[str, Exception], None], optional): Called with the event UUID and the error when a
+                poll fails. Failed polls are logged and retried after `max_interval` otherwise.
+        """
+        with self._cond:
+            event = self._events.get(event_uuid)
+            if event is None:
+                event = self._events[event_uuid] = _WatchedEvent(event_uuid, self.min_interval)
+                heapq.heappush(self._schedule, (time.monotonic(), next(self._sequence), event_uuid))
+                self._cond.notify_all()
+            event.subscribers.append(callback)
+            if on_error is not None:
+                event.error_handlers.append(on_error)
+        self.start()
+
+    def unwatch(self, event_uuid: str, callback: Optional[Callable[[EventProgressUpdate], None]] = None):
+        """
+        Remove one subscriber of an event, or all of them, and stop polling the event once it has none.
+        """
+        with self._cond:
+            event = self._events.get(event_uuid)
+            if event is None:
+                return
+            if callback is None:
+                event.subscribers.clear()
+            elif callback in event.subscribers:
+                event.subscribers.remove(callback)
+            if not event.subscribers:
+                del self._events[event_uuid]
+                self._cond.notify_all()
+
+    def watched_events(self) -> List[str]:
+        with self._cond:
+            return list(self._events)
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="equiwatt-watcher")
+            self._thread = threading.Thread(target=self._run, name="equiwatt-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait: bool = True):
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join()
+        self._executor.shutdown(wait=wait)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every watched event finished or was unwatched.
+
+        Returns:
+            bool: False if the timeout expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._events:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def _run(self):
+        with self._cond:
+            while self._running:
+                if not self._schedule:
+                    self._cond.wait()
+                    continue
+                due, _, event_uuid = self._schedule[0]
+                delay = due - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                heapq.heappop(self._schedule)
+                if event_uuid in self._events:
+                    self._executor.submit(self._poll, self._events[event_uuid])
+
+    def _reschedule(self, event: _WatchedEvent):
+        with self._cond:
+            if self._events.get(event.event_uuid) is event:
+                heapq.heappush(
+                    self._schedule, (time.monotonic() + event.interval, next(self._sequence), event.event_uuid)
+                )
+                self._cond.notify_all()
+
+    def _finish(self, event: _WatchedEvent):
+        with self._cond:
+            if self._events.get(event.event_uuid) is event:
+                del self._events[event.event_uuid]
+                self._cond.notify_all()
+
+    def _changed_assets(self, event: _WatchedEvent) -> Tuple[List[EventAssetStat], Dict[str, int]]:
+        # The new hashes are only merged once the whole walk succeeded, so the changes of a failed walk are
+        # delivered by the next one.
+        changed = []
+        hashes = {}
+        for page in self.client.get_event_asset_stats(event.event_uuid):
+            for stat in page:
+                stat_hash = _asset_stat_hash(stat)
+                if event.asset_hashes.get(stat.asset.uuid) != stat_hash:
+                    hashes[stat.asset.uuid] = stat_hash
+                    changed.append(stat)
+        return changed, hashes
+
+    def _poll(self, event: _WatchedEvent):
+        try:
+            stats = self.client.get_event_stats(event.event_uuid)
+            counts = _stats_counts(stats)
+            changed = counts != event.counts
+            finished = stats.state in self.final_states and not stats.pendingStatsAssetsCount
+            changed_assets, hashes = [], {}
+            if changed and self.include_asset_stats:
+                changed_assets, hashes = self._changed_assets(event)
+        except Exception as e:
+            event.interval = self.max_interval
+            try:
+                handlers = list(event.error_handlers)
+                if not handlers:
+                    logger.warning("Polling event %s failed: %s", event.event_uuid, e)
+                for handler in handlers:
+                    try:
+                        handler(event.event_uuid, e)
+                    except Exception:
+                        logger.exception("Error handler of event %s failed", event.event_uuid)
+            finally:
+                self._reschedule(event)
+            return
+
+        event.counts = counts
+        event.asset_hashes.update(hashes)
+        if changed:
+            event.interval = max(self.min_interval, event.interval / self.backoff)
+        else:
+            event.interval = min(self.max_interval, event.interval * self.backoff)
+
+        if changed or finished:
+            update = EventProgressUpdate(event.event_uuid, stats, changed_assets, finished)
+            for callback in list(event.subscribers):
+                try:
+                    callback(update)
+                except Exception:
+                    logger.exception("Subscriber of event %s failed", event.event_uuid)
+
+        if finished:
+            self._finish(event)
+        else:
+            self._reschedule(event)
@@ -11,4 +11,13 @@ setup(
         'requests',
         'pydantic'
     ],
+    extras_require={
+        'analytics': ['numpy'],
+        'export': ['pyarrow'],
+    },
+    entry_points={
+        'console_scripts': [
+            'equiwatt=equiwatt_api.cli:main',
+        ],
+    },
 )